@@ -1,57 +1,202 @@
+"""
+Create the header image from screenshots of the themes.
+
+The screenshots are blended in sheared slices on top of the first screenshot, which
+casts a drop shadow. Run with `--variant name=theme,theme,...` to render several headers
+in one run, decoded screenshots and shadows are shared between all variants.
+"""
+
+import argparse
+import hashlib
 import os.path
 from collections.abc import Sequence
 
-from PySide6 import QtCore, QtGui, QtWidgets
+import numpy as np
+from PySide6 import QtCore, QtGui
 
+THEMES = (
+    'catppuccin_latte',
+    'one_dark_two',
+    'monokai',
+    'catppuccin_frappe',
+    'atom_one',
+    'nord',
+)
+SHEAR = 300
+SHADOW_COLOR = (0, 0, 0, 128)
 
-class MaskedPixmapItem(QtWidgets.QGraphicsPixmapItem):
-    def __init__(
-        self,
-        pixmap: QtGui.QPixmap | QtGui.QImage,
-        parent: QtWidgets.QGraphicsItem | None = None,
-    ) -> None:
-        super().__init__(parent)
-        self.setPixmap(pixmap)
-        self.pixmap = pixmap
 
-        self._offset = 0
-        self._shear = 100
-        self._orientation = QtCore.Qt.Orientation.Horizontal
+class HeaderCompositor:
+    """
+    Composite header images directly on the pixels of the screenshots.
+
+    Decoded screenshots are cached by the hash of their file content and shadows by the
+    hash of the image that casts them, so rendering many headers from the same
+    screenshots only decodes and blurs each of them once.
+    """
 
-    def paint(
+    def __init__(
         self,
-        painter: QtGui.QPainter,
-        option: QtWidgets.QStyleOptionGraphicsItem,
-        widget: QtWidgets.QWidget | None = None,
+        shadow_radius: int = 32,
+        shadow_offset: tuple[int, int] = (0, 4),
+        shear: int = SHEAR,
     ) -> None:
-        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
-        painter.setClipPath(self._shear_path())
-        super().paint(painter, option, widget)
-
-    def _shear_path(self) -> QtGui.QPainterPath:
-        rect = self.pixmap.rect()
-        path = QtGui.QPainterPath()
-        if self._orientation == QtCore.Qt.Orientation.Horizontal:
-            path.moveTo(QtCore.QPointF(self._offset, 0))
-            path.lineTo(QtCore.QPointF(self._offset - self._shear, rect.height()))
-            path.lineTo(QtCore.QPointF(rect.width(), rect.height()))
-            path.lineTo(QtCore.QPointF(rect.width(), 0))
+        self.shadow_radius = shadow_radius
+        self.shadow_offset = shadow_offset
+        self.shear = shear
+
+        self._hashes: dict[str, tuple[tuple[int, int], str]] = {}
+        self._images: dict[str, np.ndarray] = {}
+        self._shadows: dict[tuple, np.ndarray] = {}
+
+    def load(self, path: str) -> tuple[str, np.ndarray]:
+        """Return the content hash and the premultiplied RGBA pixels of `path`."""
+
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        data = None
+        cached = self._hashes.get(path)
+        if cached and cached[0] == key:
+            digest = cached[1]
         else:
-            path.moveTo(QtCore.QPointF(0, self._offset))
-            path.lineTo(QtCore.QPointF(rect.width(), self._offset - self._shear))
-            path.lineTo(QtCore.QPointF(rect.width(), rect.height()))
-            path.lineTo(QtCore.QPointF(0, rect.height()))
-        path.closeSubpath()
-        return path
-
-    def set_offset(self, offset: int) -> None:
-        self._offset = offset
-
-    def set_shear(self, shear: int) -> None:
-        self._shear = shear
-
-    def set_orientation(self, orientation: QtCore.Qt.Orientation) -> None:
-        self._orientation = orientation
+            with open(path, 'rb') as f:
+                data = f.read()
+            digest = hashlib.sha1(data).hexdigest()
+            self._hashes[path] = (key, digest)
+
+        if digest not in self._images:
+            if data is None:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            image = QtGui.QImage.fromData(data)
+            if image.isNull():
+                raise ValueError(f'Cannot read image {path!r}')
+            self._images[digest] = _to_array(image)
+        return digest, self._images[digest]
+
+    def render(self, paths: Sequence[str]) -> QtGui.QImage:
+        """Return the header image for the screenshots at `paths`."""
+
+        if not paths:
+            raise ValueError('paths cannot be empty')
+
+        digest, base = self.load(paths[0])
+        height, width = base.shape[:2]
+        image = base.copy()
+
+        # Sheared slices, each one covers the previous ones right of its edge.
+        rows = np.arange(height)
+        for i, path in enumerate(paths[1:], start=1):
+            layer = self.load(path)[1]
+            if layer.shape != base.shape:
+                raise ValueError(f'Image {path!r} has a different size')
+            offset = int((width + self.shear) / len(paths) * i)
+            edges = offset - self.shear * (rows + 0.5) / height
+            starts = np.ceil(edges).astype(int)
+            for y, start in enumerate(starts.clip(0, width).tolist()):
+                image[y, start:] = layer[y, start:]
+
+            # Antialias the pixels on the edge by their coverage.
+            xs = starts - 1
+            coverage = (xs + 1 - edges)[:, np.newaxis]
+            valid = (xs >= 0) & (xs < width)
+            ys, xs, coverage = rows[valid], xs[valid], coverage[valid]
+            blended = image[ys, xs] * (1 - coverage) + layer[ys, xs] * coverage
+            image[ys, xs] = np.rint(blended).astype(np.uint8)
+
+        # Draw the image over the shadow of the first image.
+        left, top = self._origin()
+        canvas = self._shadow(digest, base).copy()
+        region = canvas[top : top + height, left : left + width]
+        alpha = image[..., 3:]
+        if (alpha == 255).all():
+            region[:] = image
+        else:
+            under = region.astype(np.uint16) * (255 - alpha) + 127
+            region[:] = image + (under // 255).astype(np.uint8)
+        return _to_image(canvas)
+
+    def _origin(self) -> tuple[int, int]:
+        """Returns the position of the image in the canvas."""
+
+        radius = self.shadow_radius
+        offset_x, offset_y = self.shadow_offset
+        return -int((-radius + offset_x) / 2), -int((-radius + offset_y) / 2)
+
+    def _shadow(self, digest: str, image: np.ndarray) -> np.ndarray:
+        key = (digest, self.shadow_radius, self.shadow_offset)
+        if (shadow := self._shadows.get(key)) is not None:
+            return shadow
+
+        radius = self.shadow_radius
+        height, width = image.shape[:2]
+        left, top = self._origin()
+        left += self.shadow_offset[0]
+        top += self.shadow_offset[1]
+        size = (height + radius, width + radius)
+        if (image[..., 3] == 255).all():
+            # The blur of an opaque rectangle is the product of two 1D blurs.
+            column = np.zeros(size[0], dtype=np.float32)
+            column[top : top + height] = 1
+            row = np.zeros(size[1], dtype=np.float32)
+            row[left : left + width] = 1
+            alpha = np.outer(_blur(column, radius / 2), _blur(row, radius / 2))
+        else:
+            alpha = np.zeros(size, dtype=np.float32)
+            alpha[top : top + height, left : left + width] = image[..., 3] / 255
+            alpha = _blur(alpha, radius / 2)
+
+        # Premultiplied shadow color.
+        red, green, blue, opacity = (c / 255 for c in SHADOW_COLOR)
+        color = np.array((red, green, blue, 1), dtype=np.float32) * opacity * 255
+        shadow = np.rint(alpha[..., np.newaxis] * color).astype(np.uint8)
+        self._shadows[key] = shadow
+        return shadow
+
+
+def _blur(values: np.ndarray, sigma: float) -> np.ndarray:
+    """Returns the values blurred with three box blurs approximating a gaussian."""
+
+    size = max(1, round((12 * sigma**2 / 3 + 1) ** 0.5))
+    for axis in range(values.ndim):
+        for _ in range(3):
+            values = _box_blur(values, size, axis)
+    return values
+
+
+def _box_blur(values: np.ndarray, size: int, axis: int) -> np.ndarray:
+    before = size // 2
+    after = size - before - 1
+    padding = [(0, 0)] * values.ndim
+    padding[axis] = (before + 1, after)
+    total = np.cumsum(np.pad(values, padding), axis=axis, dtype=np.float64)
+    length = values.shape[axis]
+    start = np.take(total, np.arange(length), axis=axis)
+    end = np.take(total, np.arange(size, size + length), axis=axis)
+    return ((end - start) / size).astype(np.float32)
+
+
+def _to_array(image: QtGui.QImage) -> np.ndarray:
+    image = image.convertToFormat(QtGui.QImage.Format.Format_RGBA8888_Premultiplied)
+    array = np.frombuffer(image.constBits(), dtype=np.uint8)
+    array = array.reshape(image.height(), image.bytesPerLine())
+    array = array[:, : image.width() * 4].reshape(image.height(), image.width(), 4)
+    # Copy the pixels, the converted image is deleted when this function returns.
+    return array.copy()
+
+
+def _to_image(array: np.ndarray) -> QtGui.QImage:
+    array = np.ascontiguousarray(array)
+    height, width = array.shape[:2]
+    image = QtGui.QImage(
+        array.data,
+        width,
+        height,
+        width * 4,
+        QtGui.QImage.Format.Format_RGBA8888_Premultiplied,
+    )
+    # Copy the pixels, the image doesn't own the array.
+    return image.convertToFormat(QtGui.QImage.Format.Format_ARGB32)
 
 
 def create_header_image(
@@ -60,73 +205,44 @@ def create_header_image(
     shadow_radius: int = 32,
     shadow_offset: QtCore.QPoint = QtCore.QPoint(0, 4),
 ) -> None:
-    if not paths:
-        raise ValueError('paths cannot be empty')
-
-    QtWidgets.QApplication()
-
-    # Graphics View
-    view = QtWidgets.QGraphicsView()
-    view.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
-
-    # Graphics Scene
-    rect = QtGui.QPixmap(paths[0]).rect()
-    scene = QtWidgets.QGraphicsScene()
-    scene_rect = QtCore.QRect(
-        int((-shadow_radius + shadow_offset.x()) / 2),
-        int((-shadow_radius + shadow_offset.y()) / 2),
-        rect.width() + shadow_radius,
-        rect.height() + shadow_radius,
-    )
-    scene.setSceneRect(scene_rect)
-    view.setScene(scene)
-
-    # Drop Shadow
-    drop_shadow = QtWidgets.QGraphicsDropShadowEffect()
-    drop_shadow.setOffset(shadow_offset)
-    drop_shadow.setBlurRadius(shadow_radius)
-    drop_shadow.setColor(QtGui.QColor(0, 0, 0, 128))
-
-    # Masked Images
-    for i, path in enumerate(paths):
-        pixmap = QtGui.QPixmap(path)
-        if i == 0:
-            item = QtWidgets.QGraphicsPixmapItem(pixmap)
-            item.setGraphicsEffect(drop_shadow)
-        else:
-            item = MaskedPixmapItem(pixmap)
-            shear = 300
-            offset = int((pixmap.rect().width() + shear) / len(paths) * i)
-            item.set_offset(offset)
-            item.set_shear(shear)
-        scene.addItem(item)
-
-    # Save Scene to image
-    image = QtGui.QImage(
-        scene_rect.width(), scene_rect.height(), QtGui.QImage.Format.Format_ARGB32
+    compositor = HeaderCompositor(shadow_radius, (shadow_offset.x(), shadow_offset.y()))
+    compositor.render(paths).save(output_path)
+
+
+def create_theme_header_images(
+    variants: dict[str, Sequence[str]], assets_dir: str
+) -> None:
+    """Render a header for each variant of output file name and themes."""
+
+    compositor = HeaderCompositor()
+    for file_name, themes in variants.items():
+        paths = [os.path.join(assets_dir, f'{theme}.png') for theme in themes]
+        compositor.render(paths).save(os.path.join(assets_dir, file_name))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        '--assets',
+        default=os.path.join(os.path.dirname(__file__), 'assets'),
+        help='directory with the screenshots',
     )
-    image.fill(QtCore.Qt.GlobalColor.transparent)
-    painter = QtGui.QPainter(image)
-    scene.render(painter, target=QtCore.QRectF(image.rect()), source=scene_rect)
-    painter.end()
-    image.save(output_path)
-
-
-def create_theme_header_image() -> None:
-    assets_dir = os.path.realpath('./assets')
-    themes = (
-        'catppuccin_latte',
-        'one_dark_two',
-        'monokai',
-        'catppuccin_frappe',
-        'atom_one',
-        'nord',
+    parser.add_argument(
+        '--variant',
+        action='append',
+        default=[],
+        help='header to render as file_name=theme,theme,...',
     )
-    paths = []
-    for theme in themes:
-        paths.append(os.path.join(assets_dir, f'{theme}.png'))
-    create_header_image(paths, os.path.join(assets_dir, 'header.png'))
+    args = parser.parse_args()
+
+    variants = {}
+    for variant in args.variant:
+        file_name, _, themes = variant.partition('=')
+        variants[file_name] = themes.split(',')
+    if not variants:
+        variants['header.png'] = THEMES
+    create_theme_header_images(variants, os.path.realpath(args.assets))
 
 
 if __name__ == '__main__':
-    create_theme_header_image()
+    main()
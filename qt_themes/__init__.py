@@ -1,3 +1,74 @@
-from ._theme import Theme, get_theme, get_themes, set_theme, update_palette
+import importlib
+
+from ._async import get_theme_async, get_themes_async, load_theme, load_themes
+from ._audit import ContrastCheck, ContrastPair, ContrastReport, audit_themes
+from ._bundle import ThemeBundle, compile_bundle
+from ._color import Color
+from ._compact import CompactTheme
+from ._discovery import ThemeCatalog, discover_themes
+from ._profiling import (
+    Profiler,
+    Span,
+    add_profiling_sink,
+    profiling_counters,
+    remove_profiling_sink,
+    reset_profiling_counters,
+)
+from ._scan import ScanResult, scan_themes
+from ._scope import PropagationTiming, ThemeScope, set_widget_theme
+from ._snapshot import (
+    PaletteSnapshot,
+    load_snapshot,
+    remove_snapshot,
+    restore_snapshot,
+    save_snapshot,
+    verify_snapshot,
+)
+from ._stylesheet import (
+    StyleSheet,
+    apply_stylesheet,
+    compile_stylesheet,
+    stylesheet_cache_info,
+)
+from ._theme import (
+    Theme,
+    apply_palette,
+    diff_palettes,
+    get_colors,
+    get_palette,
+    get_theme,
+    get_themes,
+    invalidate_cache,
+    palette_cache_info,
+    set_theme,
+    update_palette,
+)
 
 __version__ = '0.2.0'
+
+
+_LAZY_ATTRIBUTES = {
+    'ThemeHighlighter': '._highlight',
+    'ThemeIconEngine': '._icons',
+    'ThemeLoader': '._loader',
+    'ThemeTransition': '._transition',
+    'ThemeWatcher': '._watcher',
+    'TOKEN_STYLES': '._highlight',
+    'get_highlight_colors': '._highlight',
+    'get_text_formats': '._highlight',
+    'icon_cache_info': '._icons',
+    'themed_icon': '._icons',
+    'score_themes': '._synthesis',
+    'synthesize_theme': '._synthesis',
+    'synthesize_themes': '._synthesis',
+    'text_format_cache_info': '._highlight',
+}
+
+
+def __getattr__(name: str) -> object:
+    # Classes that subclass Qt types and functions that use NumPy are imported on first
+    # access to keep importing qt_themes free of Qt and NumPy.
+    if module_name := _LAZY_ATTRIBUTES.get(name):
+        module = importlib.import_module(module_name, __name__)
+        return getattr(module, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+
+from ._discovery import ThemeCatalog, discover_themes
+from ._theme import Theme, get_theme
+
+MAX_WORKERS = 4
+
+logger = logging.getLogger(__package__)
+
+
+def load_theme(name: str, executor: Executor | None = None) -> Future[Theme | None]:
+    """
+    Load the theme with `name` in the background.
+
+    Return a future with the result of `get_theme()`. Themes are loaded on a shared
+    thread pool unless an `executor` is provided.
+    """
+
+    return (executor or _get_executor()).submit(get_theme, name)
+
+
+def load_themes(
+    executor: Executor | None = None,
+    callback: Callable[[str, Theme], None] | None = None,
+) -> Future[dict[str, Theme]]:
+    """
+    Load all valid themes in the background.
+
+    Return a future with the result of `get_themes()`. The directories are scanned and
+    every theme is parsed as a separate task. If provided, `callback` is called with
+    the name and theme as soon as each theme is loaded, from the worker thread.
+    Exceptions raised by the callback are logged.
+    """
+
+    executor = executor or _get_executor()
+    result: Future[dict[str, Theme]] = Future()
+    result.set_running_or_notify_cancel()
+
+    def scanned(future: Future[ThemeCatalog]) -> None:
+        try:
+            catalog = future.result()
+        except Exception as e:
+            result.set_exception(e)
+            return
+
+        themes: dict[str, Theme] = {}
+        lock = threading.Lock()
+        pending = len(catalog)
+        if not pending:
+            result.set_result({})
+            return
+
+        def loaded(name: str, future: Future[Theme | None]) -> None:
+            nonlocal pending
+            try:
+                theme = future.result()
+            except Exception as e:
+                logger.warning(f'Cannot load theme {name!r}: {e}')
+                theme = None
+
+            if theme is not None:
+                with lock:
+                    themes[name] = theme
+                # A failing callback must not keep the result from completing.
+                if callback:
+                    try:
+                        callback(name, theme)
+                    except Exception as e:
+                        logger.warning(f'Theme callback failed for {name!r}: {e}')
+
+            with lock:
+                pending -= 1
+                done = not pending
+            if done:
+                # Keep the order of get_themes().
+                result.set_result({n: themes[n] for n in catalog if n in themes})
+
+        for name in catalog:
+            task = executor.submit(catalog.get, name)
+            task.add_done_callback(lambda f, n=name: loaded(n, f))
+
+    executor.submit(discover_themes).add_done_callback(scanned)
+    return result
+
+
+async def get_theme_async(name: str, executor: Executor | None = None) -> Theme | None:
+    """Return the theme with `name` without blocking the event loop."""
+
+    import asyncio
+
+    return await asyncio.wrap_future(load_theme(name, executor))
+
+
+async def get_themes_async(executor: Executor | None = None) -> dict[str, Theme]:
+    """Return all valid themes without blocking the event loop."""
+
+    import asyncio
+
+    return await asyncio.wrap_future(load_themes(executor))
+
+
+def _get_executor() -> Executor:
+    """Returns the shared thread pool used to load themes."""
+
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(MAX_WORKERS, thread_name_prefix='qt_themes')
+        return _executor
+
+
+_lock = threading.Lock()
+_executor: Executor | None = None
@@ -0,0 +1,178 @@
+"""
+Audit the contrast of the palettes of all themes against WCAG.
+
+Run `qt-themes audit` to print a report. The exit code is 1 if any check fails.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+from typing import NamedTuple
+
+from ._qt import QtGui
+from ._theme import GROUP_NAMES, Theme, get_themes, update_palette
+
+
+class ContrastPair(NamedTuple):
+    foreground: str
+    background: str
+    # The minimum contrast ratio, 4.5 is WCAG AA for normal text.
+    minimum: float = 4.5
+
+
+CONTRAST_PAIRS = (
+    ContrastPair('WindowText', 'Window'),
+    ContrastPair('Text', 'Base'),
+    ContrastPair('Text', 'AlternateBase'),
+    ContrastPair('ButtonText', 'Button'),
+    ContrastPair('HighlightedText', 'Highlight'),
+    ContrastPair('ToolTipText', 'ToolTipBase'),
+    ContrastPair('PlaceholderText', 'Base', 3),
+    ContrastPair('Link', 'Base'),
+    ContrastPair('LinkVisited', 'Base'),
+)
+
+# WCAG doesn't require contrast for disabled controls.
+DISABLED_MINIMUM = 0.0
+# `update_palette()` mutes links to surface1 in the Inactive group as decoration of
+# unfocused windows, pairs with them use the inactive minimum in that group. The
+# Highlight role is muted as well, but the selected text on it is still content.
+INACTIVE_MUTED_ROLES = ('Link', 'LinkVisited')
+INACTIVE_MINIMUM = 0.0
+
+
+@dataclasses.dataclass
+class ContrastCheck:
+    theme: str
+    group: str
+    foreground: str
+    background: str
+    ratio: float
+    minimum: float
+
+    @property
+    def passed(self) -> bool:
+        return self.ratio >= self.minimum
+
+
+@dataclasses.dataclass
+class ContrastReport:
+    """The contrast checks of `audit_themes()`."""
+
+    checks: list[ContrastCheck] = dataclasses.field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return all(check.passed for check in self.checks)
+
+    def failures(self) -> list[ContrastCheck]:
+        return [check for check in self.checks if not check.passed]
+
+    def to_json(self) -> str:
+        data = {
+            'passed': self.passed,
+            'failures': len(self.failures()),
+            'checks': [
+                {**dataclasses.asdict(check), 'passed': check.passed}
+                for check in self.checks
+            ],
+        }
+        return json.dumps(data, indent=2)
+
+    def to_text(self, failures_only: bool = True) -> str:
+        lines = []
+        checks = self.failures() if failures_only else self.checks
+        for check in checks:
+            status = 'PASS' if check.passed else 'FAIL'
+            lines.append(
+                f'{status} {check.theme} {check.group} '
+                f'{check.foreground}/{check.background}: '
+                f'{check.ratio:.2f} (minimum {check.minimum:g})'
+            )
+        themes = len({check.theme for check in self.checks})
+        lines.append(
+            f'{len(self.failures())} of {len(self.checks)} checks failed '
+            f'for {themes} themes.'
+        )
+        return '\n'.join(lines)
+
+
+def audit_themes(
+    themes: dict[str, Theme] | None = None,
+    pairs: tuple[ContrastPair, ...] = CONTRAST_PAIRS,
+    disabled_minimum: float = DISABLED_MINIMUM,
+    inactive_minimum: float = INACTIVE_MINIMUM,
+) -> ContrastReport:
+    """
+    Check the contrast of the foreground and background roles of the palette of each
+    theme in every color group.
+
+    The palettes are built with `update_palette()`, the contrast ratios of all themes
+    are calculated together.
+
+    :param themes: The themes by name, by default all themes of `get_themes()`.
+    :param pairs: The palette roles to check.
+    :param disabled_minimum: The minimum contrast ratio for the Disabled group.
+    :param inactive_minimum: The minimum contrast ratio for the pairs with the muted
+        roles of `INACTIVE_MUTED_ROLES` in the Inactive group.
+    """
+
+    from . import _colormath
+
+    if themes is None:
+        themes = get_themes()
+
+    ColorGroup = QtGui.QPalette.ColorGroup
+    ColorRole = QtGui.QPalette.ColorRole
+    groups = [getattr(ColorGroup, name) for name in GROUP_NAMES]
+    role_pairs = [
+        (getattr(ColorRole, pair.foreground), getattr(ColorRole, pair.background))
+        for pair in pairs
+    ]
+
+    foregrounds = []
+    backgrounds = []
+    for theme in themes.values():
+        palette = QtGui.QPalette()
+        update_palette(palette, theme)
+        for group in groups:
+            for foreground, background in role_pairs:
+                foregrounds.append(palette.color(group, foreground).getRgb())
+                backgrounds.append(palette.color(group, background).getRgb())
+
+    colors = _colormath.composite(foregrounds, backgrounds)
+    ratios = _colormath.contrast_ratio(colors, _colormath.to_float(backgrounds))
+
+    report = ContrastReport()
+    index = 0
+    for name in themes:
+        for group in GROUP_NAMES:
+            for pair in pairs:
+                minimum = _minimum(pair, group, disabled_minimum, inactive_minimum)
+                check = ContrastCheck(
+                    theme=name,
+                    group=group,
+                    foreground=pair.foreground,
+                    background=pair.background,
+                    ratio=round(float(ratios[index]), 2),
+                    minimum=minimum,
+                )
+                report.checks.append(check)
+                index += 1
+    return report
+
+
+def _minimum(
+    pair: ContrastPair, group: str, disabled_minimum: float, inactive_minimum: float
+) -> float:
+    """Returns the minimum contrast ratio of `pair` in `group`."""
+
+    if group == 'Disabled':
+        return disabled_minimum
+    if group == 'Inactive' and (
+        pair.foreground in INACTIVE_MUTED_ROLES
+        or pair.background in INACTIVE_MUTED_ROLES
+    ):
+        return inactive_minimum
+    return pair.minimum
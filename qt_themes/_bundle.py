@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+import dataclasses
+import logging
+import mmap
+import os
+import struct
+import threading
+from json import JSONDecodeError
+
+from ._color import Color
+from ._theme import (
+    FIELDS,
+    _get_paths,
+    _list_theme_files,
+    _load_colors,
+    _theme_dependencies,
+)
+
+BUNDLE = 'QT_THEMES_BUNDLE'
+
+MAGIC = b'QTTB'
+VERSION = 2
+
+# magic, version, field count, path count, entry count, index size
+HEADER = struct.Struct('<4sHHIII')
+# mtime_ns, path length
+PATH_RECORD = struct.Struct('<qH')
+# mtime_ns, size, flags, mask, colors offset, name length, path length,
+# dependency count
+ENTRY_RECORD = struct.Struct('<qqIIIHHH')
+# mtime_ns, size, path length
+DEPENDENCY_RECORD = struct.Struct('<qqH')
+
+FLAG_VALID = 1 << 0
+
+logger = logging.getLogger(__package__)
+
+
+@dataclasses.dataclass(frozen=True)
+class _Entry:
+    name: str
+    path: str
+    mtime: int
+    size: int
+    valid: bool
+    mask: int
+    offset: int
+    # The path, mtime_ns and size of each extended theme file.
+    dependencies: tuple[tuple[str, int, int], ...] = ()
+
+
+class ThemeBundle:
+    """
+    A compiled file holding all themes as packed RGBA uint32 values.
+
+    The file starts with a header index of the search paths and theme files it was
+    compiled from, followed by one array of RGBA values per theme in the `Theme` field
+    order. The file is memory-mapped and colors are decoded on access.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :raises OSError: if the bundle cannot be read.
+        :raises ValueError: if the bundle is invalid.
+        """
+
+        self.path = path
+        with open(path, 'rb') as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            self._read_index()
+        except (struct.error, UnicodeDecodeError) as e:
+            self.close()
+            raise ValueError(f'Invalid theme bundle {path!r}.') from e
+        except ValueError:
+            self.close()
+            raise
+
+    def _read_index(self) -> None:
+        buffer = self._buffer
+        magic, version, field_count, path_count, entry_count, index_size = (
+            HEADER.unpack_from(buffer)
+        )
+        if magic != MAGIC or version != VERSION or field_count != len(FIELDS):
+            raise ValueError(f'Unsupported theme bundle {self.path!r}.')
+        if len(buffer) < index_size + entry_count * field_count * 4:
+            raise ValueError(f'Truncated theme bundle {self.path!r}.')
+
+        offset = HEADER.size
+        self.search_paths: dict[str, int] = {}
+        for _ in range(path_count):
+            mtime, length = PATH_RECORD.unpack_from(buffer, offset)
+            offset += PATH_RECORD.size
+            path = buffer[offset : offset + length].decode()
+            offset += length
+            self.search_paths[path] = mtime
+
+        self._entries: list[_Entry] = []
+        self._names: dict[str, list[_Entry]] = {}
+        for _ in range(entry_count):
+            (
+                mtime,
+                size,
+                flags,
+                mask,
+                colors_offset,
+                name_length,
+                path_length,
+                dependency_count,
+            ) = ENTRY_RECORD.unpack_from(buffer, offset)
+            offset += ENTRY_RECORD.size
+            name = buffer[offset : offset + name_length].decode()
+            offset += name_length
+            path = buffer[offset : offset + path_length].decode()
+            offset += path_length
+            dependencies = []
+            for _ in range(dependency_count):
+                dependency_mtime, dependency_size, length = (
+                    DEPENDENCY_RECORD.unpack_from(buffer, offset)
+                )
+                offset += DEPENDENCY_RECORD.size
+                dependency = buffer[offset : offset + length].decode()
+                offset += length
+                dependencies.append((dependency, dependency_mtime, dependency_size))
+            entry = _Entry(
+                name=name,
+                path=path,
+                mtime=mtime,
+                size=size,
+                valid=bool(flags & FLAG_VALID),
+                mask=mask,
+                offset=colors_offset,
+                dependencies=tuple(dependencies),
+            )
+            self._entries.append(entry)
+            self._names.setdefault(name, []).append(entry)
+
+    def close(self) -> None:
+        self._buffer.close()
+
+    def is_current(self, search_paths: tuple[str, ...]) -> bool:
+        """
+        Return whether the bundle was compiled from `search_paths` and no theme files
+        were added or removed since.
+        """
+
+        if tuple(self.search_paths) != search_paths:
+            return False
+        for path, mtime in self.search_paths.items():
+            if _stat_mtime(path) != mtime:
+                return False
+        return True
+
+    def get_colors(self, name: str) -> dict[str, Color]:
+        """
+        Return the colors of the theme with `name`, the same as `get_colors()` would.
+
+        :raises KeyError: if no up-to-date theme with `name` is in the bundle.
+        :raises TypeError: if the theme file was invalid when compiled.
+        """
+
+        entry = self._names[name][0]
+        if not _is_current(entry):
+            raise KeyError(name)
+        if not entry.valid:
+            raise TypeError(f'Invalid theme {entry.path!r}.')
+        return self._decode(entry)
+
+    def get_all_colors(self) -> dict[str, dict[str, Color]]:
+        """
+        Return the colors of all valid themes by name.
+
+        :raises KeyError: if any theme file changed since the bundle was compiled.
+        """
+
+        themes = {}
+        for entry in self._entries:
+            if not _is_current(entry):
+                raise KeyError(entry.name)
+            if entry.valid:
+                themes[entry.name] = self._decode(entry)
+        return themes
+
+    def _decode(self, entry: _Entry) -> dict[str, Color]:
+        values = struct.unpack_from(f'<{len(FIELDS)}I', self._buffer, entry.offset)
+        colors = {}
+        for i, (field, value) in enumerate(zip(FIELDS, values)):
+            if entry.mask & (1 << i):
+                colors[field] = Color(
+                    value >> 24, (value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF
+                )
+        return colors
+
+
+def compile_bundle(path: str) -> None:
+    """
+    Compile all themes found on disk into a theme bundle at `path`.
+
+    The bundle is only used by `get_theme()` and `get_themes()` if the environment
+    variable `QT_THEMES_BUNDLE` points to it and the themes on disk didn't change.
+    """
+
+    search_paths = _get_paths()
+    entries = []
+    color_data = bytearray()
+    for search_path in search_paths:
+        for name, theme_path in _list_theme_files(search_path):
+            try:
+                stat = os.stat(theme_path)
+            except OSError:
+                continue
+            try:
+                colors = _load_colors(theme_path)
+            except (JSONDecodeError, TypeError):
+                logger.warning(f'Invalid theme {theme_path!r}.')
+                colors = None
+
+            flags = mask = 0
+            values = [0] * len(FIELDS)
+            if colors is not None:
+                flags |= FLAG_VALID
+                for i, field in enumerate(FIELDS):
+                    if (color := colors.get(field)) is not None:
+                        mask |= 1 << i
+                        r, g, b, a = color
+                        values[i] = r << 24 | g << 16 | b << 8 | a
+            dependencies = []
+            for dependency in _theme_dependencies(theme_path):
+                try:
+                    dependency_stat = os.stat(dependency)
+                except OSError:
+                    continue
+                dependencies.append(
+                    (
+                        dependency.encode(),
+                        dependency_stat.st_mtime_ns,
+                        dependency_stat.st_size,
+                    )
+                )
+            entries.append(
+                (
+                    name.encode(),
+                    theme_path.encode(),
+                    stat,
+                    flags,
+                    mask,
+                    len(color_data),
+                    dependencies,
+                )
+            )
+            color_data += struct.pack(f'<{len(FIELDS)}I', *values)
+
+    encoded_paths = [search_path.encode() for search_path in search_paths]
+    index_size = HEADER.size
+    index_size += sum(PATH_RECORD.size + len(p) for p in encoded_paths)
+    index_size += sum(ENTRY_RECORD.size + len(e[0]) + len(e[1]) for e in entries)
+    index_size += sum(DEPENDENCY_RECORD.size + len(d[0]) for e in entries for d in e[6])
+
+    data = bytearray()
+    data += HEADER.pack(
+        MAGIC, VERSION, len(FIELDS), len(search_paths), len(entries), index_size
+    )
+    for search_path, path_data in zip(search_paths, encoded_paths):
+        data += PATH_RECORD.pack(_stat_mtime(search_path), len(path_data))
+        data += path_data
+    for name_data, path_data, stat, flags, mask, offset, dependencies in entries:
+        data += ENTRY_RECORD.pack(
+            stat.st_mtime_ns,
+            stat.st_size,
+            flags,
+            mask,
+            index_size + offset,
+            len(name_data),
+            len(path_data),
+            len(dependencies),
+        )
+        data += name_data
+        data += path_data
+        for dependency_data, mtime, size in dependencies:
+            data += DEPENDENCY_RECORD.pack(mtime, size, len(dependency_data))
+            data += dependency_data
+    data += color_data
+
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+    logger.debug(f'Compiled {len(entries)} themes to {path!r}.')
+
+
+def get_bundle() -> ThemeBundle | None:
+    """
+    Return the theme bundle set with `QT_THEMES_BUNDLE` if it is valid and up-to-date
+    with the current search paths.
+    """
+
+    if not (path := os.getenv(BUNDLE)):
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        global _bundle
+        if _bundle is None or _bundle[0] != key:
+            try:
+                bundle = ThemeBundle(path)
+            except (OSError, ValueError) as e:
+                logger.warning(str(e))
+                bundle = None
+            _bundle = (key, bundle)
+        bundle = _bundle[1]
+
+    if bundle is None or not bundle.is_current(_get_paths()):
+        return None
+    return bundle
+
+
+def _is_current(entry: _Entry) -> bool:
+    files = ((entry.path, entry.mtime, entry.size), *entry.dependencies)
+    for path, mtime, size in files:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if stat.st_mtime_ns != mtime or stat.st_size != size:
+            return False
+    return True
+
+
+def _stat_mtime(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
+
+
+_lock = threading.Lock()
+_bundle: tuple[tuple[str, int, int], ThemeBundle | None] | None = None
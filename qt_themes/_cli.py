@@ -0,0 +1,221 @@
+"""
+Command line tool to inspect, validate and compile themes.
+
+The tool doesn't need a display, only the palette commands import QtGui.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from json import JSONDecodeError
+
+from . import __version__
+from ._audit import DISABLED_MINIMUM, INACTIVE_MINIMUM, audit_themes
+from ._bundle import compile_bundle
+from ._color import Color
+from ._discovery import discover_themes
+from ._qt import QtGui
+from ._theme import (
+    EXTENDS,
+    FIELDS,
+    GROUP_NAMES,
+    ROLE_NAMES,
+    Theme,
+    _get_paths,
+    _list_theme_files,
+    _load_colors,
+    get_themes,
+    update_palette,
+)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='qt-themes', description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument('--version', action='version', version=__version__)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = subparsers.add_parser('list', help='list the themes and their paths')
+    list_parser.add_argument('--json', action='store_true', help='print as JSON')
+    list_parser.set_defaults(function=_list)
+
+    validate_parser = subparsers.add_parser(
+        'validate', help='validate theme files and report all errors'
+    )
+    validate_parser.add_argument(
+        'paths',
+        nargs='*',
+        help='theme files or directories, by default all search paths',
+    )
+    validate_parser.add_argument(
+        '--workers', type=int, default=None, help='number of worker threads'
+    )
+    validate_parser.set_defaults(function=_validate)
+
+    dump_parser = subparsers.add_parser('dump', help='print the palettes of themes')
+    dump_parser.add_argument('themes', nargs='*', help='names of the themes')
+    dump_parser.set_defaults(function=_dump)
+
+    compile_parser = subparsers.add_parser(
+        'compile', help='compile all themes into a bundle'
+    )
+    compile_parser.add_argument('output', help='path of the bundle')
+    compile_parser.set_defaults(function=_compile)
+
+    audit_parser = subparsers.add_parser(
+        'audit', help='check the contrast of the palettes against WCAG'
+    )
+    audit_parser.add_argument('themes', nargs='*', help='names of the themes')
+    audit_parser.add_argument('--json', action='store_true', help='print as JSON')
+    audit_parser.add_argument(
+        '--all', action='store_true', help='also print passed checks'
+    )
+    audit_parser.add_argument(
+        '--disabled-minimum',
+        type=float,
+        default=DISABLED_MINIMUM,
+        help='minimum contrast ratio for disabled colors',
+    )
+    audit_parser.add_argument(
+        '--inactive-minimum',
+        type=float,
+        default=INACTIVE_MINIMUM,
+        help='minimum contrast ratio for muted inactive links',
+    )
+    audit_parser.set_defaults(function=_audit)
+
+    args = parser.parse_args(argv)
+    return args.function(parser, args)
+
+
+def _list(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    paths = discover_themes().paths
+    if args.json:
+        print(json.dumps(paths, indent=2))
+        return 0
+    width = max((len(name) for name in paths), default=0)
+    for name, path in paths.items():
+        print(f'{name:<{width}}  {path}')
+    return 0
+
+
+def _validate(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    paths = []
+    for path in args.paths or _get_paths():
+        if os.path.isdir(path):
+            paths.extend(theme_path for _, theme_path in _list_theme_files(path))
+        elif os.path.isfile(path) or args.paths:
+            paths.append(path)
+
+    with ThreadPoolExecutor(args.workers, thread_name_prefix='qt_themes_cli') as pool:
+        results = list(pool.map(_validate_file, paths))
+
+    invalid = 0
+    for path, errors in zip(paths, results):
+        if errors:
+            invalid += 1
+        for error in errors:
+            print(f'{path}: {error}')
+    print(f'{invalid} of {len(paths)} theme files are invalid.', file=sys.stderr)
+    return 1 if invalid else 0
+
+
+def _dump(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    themes = _select_themes(parser, args.themes)
+    ColorGroup = QtGui.QPalette.ColorGroup
+    ColorRole = QtGui.QPalette.ColorRole
+    # Roles that don't exist in the Qt binding are skipped.
+    roles = {n: r for n in ROLE_NAMES if (r := getattr(ColorRole, n, None)) is not None}
+
+    data = {}
+    for name, theme in themes.items():
+        palette = QtGui.QPalette()
+        update_palette(palette, theme)
+        data[name] = {
+            group: {
+                role_name: _color_name(palette.color(getattr(ColorGroup, group), role))
+                for role_name, role in roles.items()
+            }
+            for group in GROUP_NAMES
+        }
+    print(json.dumps(data, indent=2))
+    return 0
+
+
+def _compile(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    compile_bundle(args.output)
+    return 0
+
+
+def _audit(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    themes = _select_themes(parser, args.themes)
+    report = audit_themes(
+        themes,
+        disabled_minimum=args.disabled_minimum,
+        inactive_minimum=args.inactive_minimum,
+    )
+    if args.json:
+        print(report.to_json())
+    else:
+        print(report.to_text(failures_only=not args.all))
+    return 0 if report.passed else 1
+
+
+def _validate_file(path: str) -> list[str]:
+    """Return all errors of the theme file at `path`."""
+
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except OSError as e:
+        return [f'Cannot read file: {e.strerror}.']
+    except JSONDecodeError as e:
+        return [f'Invalid JSON: {e}.']
+    if not isinstance(data, dict):
+        return ['Unexpected theme data.']
+
+    errors = []
+    for key, value in data.items():
+        if key == EXTENDS:
+            if not isinstance(value, str):
+                errors.append(f'Unexpected extended theme {value!r}.')
+            continue
+        if key not in FIELDS:
+            errors.append(f'Unexpected theme color {key!r}.')
+            continue
+        try:
+            Color.from_string(value)
+        except ValueError as e:
+            errors.append(f'{key}: {e}')
+
+    # Extended themes are only checked once the file itself is valid.
+    if not errors and EXTENDS in data:
+        try:
+            _load_colors(path)
+        except (OSError, JSONDecodeError, TypeError) as e:
+            errors.append(str(e))
+    return errors
+
+
+def _select_themes(
+    parser: argparse.ArgumentParser, names: list[str]
+) -> dict[str, Theme]:
+    themes = get_themes()
+    if names:
+        if missing := set(names) - set(themes):
+            parser.error(f'unknown themes: {", ".join(sorted(missing))}')
+        themes = {name: themes[name] for name in names}
+    return themes
+
+
+def _color_name(color: QtGui.QColor) -> str:
+    color = Color.from_qcolor(color)
+    if color.alpha == 255:
+        return color.name()
+    return f'#{color.rgba():08x}'
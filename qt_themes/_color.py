@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import string
+from typing import NamedTuple
+
+from ._qt import QtGui
+
+
+class Color(NamedTuple):
+    """
+    An 8-bit RGBA color that doesn't require Qt.
+
+    The methods mirror the QColor methods with the same name.
+    """
+
+    red: int
+    green: int
+    blue: int
+    alpha: int = 255
+
+    @classmethod
+    def from_string(cls, value: str) -> Color:
+        """
+        Return the color for a string in the formats that QColor accepts: #RGB,
+        #RRGGBB, #AARRGGBB, #RRRGGGBBB, #RRRRGGGGBBBB or an SVG color name such as
+        `white` or `transparent`.
+
+        :raises ValueError: if the string is not a valid color.
+        """
+
+        if not isinstance(value, str):
+            raise ValueError(f'Invalid color {value!r}.')
+        if not value.startswith('#'):
+            # Names are matched case-insensitively and ignore spaces, like QColor.
+            name = value.replace(' ', '').lower()
+            if name == 'transparent':
+                return cls(0, 0, 0, 0)
+            if (rgb := _NAMED_COLORS.get(name)) is None:
+                raise ValueError(f'Invalid color {value!r}.')
+            return cls((rgb >> 16) & 0xFF, (rgb >> 8) & 0xFF, rgb & 0xFF)
+
+        digits = value[1:]
+        # int() also accepts signs, underscores, spaces and a 0x prefix.
+        if not digits or not all(c in string.hexdigits for c in digits):
+            raise ValueError(f'Invalid color {value!r}.')
+        number = int(digits, 16)
+
+        if len(digits) == 3:
+            r, g, b = (number >> 8) & 0xF, (number >> 4) & 0xF, number & 0xF
+            return cls(r * 0x11, g * 0x11, b * 0x11)
+        if len(digits) == 6:
+            return cls((number >> 16) & 0xFF, (number >> 8) & 0xFF, number & 0xFF)
+        if len(digits) == 8:
+            return cls.from_rgba(number)
+        if len(digits) in (9, 12):
+            # 12 and 16 bits per channel, scaled to 8 bits.
+            bits = len(digits) // 3 * 4
+            mask = (1 << bits) - 1
+            channels = (number >> bits * 2, number >> bits, number)
+            r, g, b = (round((c & mask) * 255 / mask) for c in channels)
+            return cls(r, g, b)
+        raise ValueError(f'Invalid color {value!r}.')
+
+    @classmethod
+    def from_rgba(cls, rgba: int) -> Color:
+        """Return the color for an #AARRGGBB integer."""
+
+        return cls(
+            (rgba >> 16) & 0xFF, (rgba >> 8) & 0xFF, rgba & 0xFF, (rgba >> 24) & 0xFF
+        )
+
+    @classmethod
+    def from_qcolor(cls, color: QtGui.QColor) -> Color:
+        return cls.from_rgba(color.rgba())
+
+    def name(self) -> str:
+        return f'#{self.red:02x}{self.green:02x}{self.blue:02x}'
+
+    def rgba(self) -> int:
+        return self.alpha << 24 | self.red << 16 | self.green << 8 | self.blue
+
+    def value(self) -> int:
+        return max(self.red, self.green, self.blue)
+
+    def to_qcolor(self) -> QtGui.QColor:
+        return QtGui.QColor(self.red, self.green, self.blue, self.alpha)
+
+    @classmethod
+    def from_oklab(
+        cls, lightness: float, a: float, b: float, alpha: int = 255
+    ) -> Color:
+        """Return the color for OKLab coordinates, clipped to the sRGB gamut."""
+
+        l_ = (lightness + 0.3963377774 * a + 0.2158037573 * b) ** 3
+        m_ = (lightness - 0.1055613458 * a - 0.0638541728 * b) ** 3
+        s_ = (lightness - 0.0894841775 * a - 1.2914855480 * b) ** 3
+        linear = (
+            4.0767416621 * l_ - 3.3077115913 * m_ + 0.2309699292 * s_,
+            -1.2684380046 * l_ + 2.6097574011 * m_ - 0.3413193965 * s_,
+            -0.0041960863 * l_ - 0.7034186147 * m_ + 1.7076147010 * s_,
+        )
+        r, g, b = (round(_encode_srgb(min(max(c, 0), 1)) * 255) for c in linear)
+        return cls(r, g, b, alpha)
+
+    def to_oklab(self) -> tuple[float, float, float]:
+        """Return the OKLab lightness, a and b coordinates of the color."""
+
+        r, g, b = (_decode_srgb(c / 255) for c in (self.red, self.green, self.blue))
+        l_ = (0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b) ** (1 / 3)
+        m_ = (0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b) ** (1 / 3)
+        s_ = (0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b) ** (1 / 3)
+        return (
+            0.2104542553 * l_ + 0.7936177850 * m_ - 0.0040720468 * s_,
+            1.9779984951 * l_ - 2.4285922050 * m_ + 0.4505937099 * s_,
+            0.0259040371 * l_ + 0.7827717662 * m_ - 0.8086757660 * s_,
+        )
+
+    def mix(self, other: Color, t: float) -> Color:
+        """Return the color `t` of the way to `other`, interpolated in OKLab."""
+
+        start = self.to_oklab()
+        end = other.to_oklab()
+        lab = (s + (e - s) * t for s, e in zip(start, end))
+        alpha = round(self.alpha + (other.alpha - self.alpha) * t)
+        return Color.from_oklab(*lab, alpha=alpha)
+
+
+def _decode_srgb(value: float) -> float:
+    if value <= 0.04045:
+        return value / 12.92
+    return ((value + 0.055) / 1.055) ** 2.4
+
+
+def _encode_srgb(value: float) -> float:
+    if value <= 0.0031308:
+        return value * 12.92
+    return 1.055 * value ** (1 / 2.4) - 0.055
+
+
+# The SVG color names that QColor accepts, as RGB integers.
+_NAMED_COLORS = {
+    'aliceblue': 0xF0F8FF,
+    'antiquewhite': 0xFAEBD7,
+    'aqua': 0x00FFFF,
+    'aquamarine': 0x7FFFD4,
+    'azure': 0xF0FFFF,
+    'beige': 0xF5F5DC,
+    'bisque': 0xFFE4C4,
+    'black': 0x000000,
+    'blanchedalmond': 0xFFEBCD,
+    'blue': 0x0000FF,
+    'blueviolet': 0x8A2BE2,
+    'brown': 0xA52A2A,
+    'burlywood': 0xDEB887,
+    'cadetblue': 0x5F9EA0,
+    'chartreuse': 0x7FFF00,
+    'chocolate': 0xD2691E,
+    'coral': 0xFF7F50,
+    'cornflowerblue': 0x6495ED,
+    'cornsilk': 0xFFF8DC,
+    'crimson': 0xDC143C,
+    'cyan': 0x00FFFF,
+    'darkblue': 0x00008B,
+    'darkcyan': 0x008B8B,
+    'darkgoldenrod': 0xB8860B,
+    'darkgray': 0xA9A9A9,
+    'darkgreen': 0x006400,
+    'darkgrey': 0xA9A9A9,
+    'darkkhaki': 0xBDB76B,
+    'darkmagenta': 0x8B008B,
+    'darkolivegreen': 0x556B2F,
+    'darkorange': 0xFF8C00,
+    'darkorchid': 0x9932CC,
+    'darkred': 0x8B0000,
+    'darksalmon': 0xE9967A,
+    'darkseagreen': 0x8FBC8F,
+    'darkslateblue': 0x483D8B,
+    'darkslategray': 0x2F4F4F,
+    'darkslategrey': 0x2F4F4F,
+    'darkturquoise': 0x00CED1,
+    'darkviolet': 0x9400D3,
+    'deeppink': 0xFF1493,
+    'deepskyblue': 0x00BFFF,
+    'dimgray': 0x696969,
+    'dimgrey': 0x696969,
+    'dodgerblue': 0x1E90FF,
+    'firebrick': 0xB22222,
+    'floralwhite': 0xFFFAF0,
+    'forestgreen': 0x228B22,
+    'fuchsia': 0xFF00FF,
+    'gainsboro': 0xDCDCDC,
+    'ghostwhite': 0xF8F8FF,
+    'gold': 0xFFD700,
+    'goldenrod': 0xDAA520,
+    'gray': 0x808080,
+    'green': 0x008000,
+    'greenyellow': 0xADFF2F,
+    'grey': 0x808080,
+    'honeydew': 0xF0FFF0,
+    'hotpink': 0xFF69B4,
+    'indianred': 0xCD5C5C,
+    'indigo': 0x4B0082,
+    'ivory': 0xFFFFF0,
+    'khaki': 0xF0E68C,
+    'lavender': 0xE6E6FA,
+    'lavenderblush': 0xFFF0F5,
+    'lawngreen': 0x7CFC00,
+    'lemonchiffon': 0xFFFACD,
+    'lightblue': 0xADD8E6,
+    'lightcoral': 0xF08080,
+    'lightcyan': 0xE0FFFF,
+    'lightgoldenrodyellow': 0xFAFAD2,
+    'lightgray': 0xD3D3D3,
+    'lightgreen': 0x90EE90,
+    'lightgrey': 0xD3D3D3,
+    'lightpink': 0xFFB6C1,
+    'lightsalmon': 0xFFA07A,
+    'lightseagreen': 0x20B2AA,
+    'lightskyblue': 0x87CEFA,
+    'lightslategray': 0x778899,
+    'lightslategrey': 0x778899,
+    'lightsteelblue': 0xB0C4DE,
+    'lightyellow': 0xFFFFE0,
+    'lime': 0x00FF00,
+    'limegreen': 0x32CD32,
+    'linen': 0xFAF0E6,
+    'magenta': 0xFF00FF,
+    'maroon': 0x800000,
+    'mediumaquamarine': 0x66CDAA,
+    'mediumblue': 0x0000CD,
+    'mediumorchid': 0xBA55D3,
+    'mediumpurple': 0x9370DB,
+    'mediumseagreen': 0x3CB371,
+    'mediumslateblue': 0x7B68EE,
+    'mediumspringgreen': 0x00FA9A,
+    'mediumturquoise': 0x48D1CC,
+    'mediumvioletred': 0xC71585,
+    'midnightblue': 0x191970,
+    'mintcream': 0xF5FFFA,
+    'mistyrose': 0xFFE4E1,
+    'moccasin': 0xFFE4B5,
+    'navajowhite': 0xFFDEAD,
+    'navy': 0x000080,
+    'oldlace': 0xFDF5E6,
+    'olive': 0x808000,
+    'olivedrab': 0x6B8E23,
+    'orange': 0xFFA500,
+    'orangered': 0xFF4500,
+    'orchid': 0xDA70D6,
+    'palegoldenrod': 0xEEE8AA,
+    'palegreen': 0x98FB98,
+    'paleturquoise': 0xAFEEEE,
+    'palevioletred': 0xDB7093,
+    'papayawhip': 0xFFEFD5,
+    'peachpuff': 0xFFDAB9,
+    'peru': 0xCD853F,
+    'pink': 0xFFC0CB,
+    'plum': 0xDDA0DD,
+    'powderblue': 0xB0E0E6,
+    'purple': 0x800080,
+    'red': 0xFF0000,
+    'rosybrown': 0xBC8F8F,
+    'royalblue': 0x4169E1,
+    'saddlebrown': 0x8B4513,
+    'salmon': 0xFA8072,
+    'sandybrown': 0xF4A460,
+    'seagreen': 0x2E8B57,
+    'seashell': 0xFFF5EE,
+    'sienna': 0xA0522D,
+    'silver': 0xC0C0C0,
+    'skyblue': 0x87CEEB,
+    'slateblue': 0x6A5ACD,
+    'slategray': 0x708090,
+    'slategrey': 0x708090,
+    'snow': 0xFFFAFA,
+    'springgreen': 0x00FF7F,
+    'steelblue': 0x4682B4,
+    'tan': 0xD2B48C,
+    'teal': 0x008080,
+    'thistle': 0xD8BFD8,
+    'tomato': 0xFF6347,
+    'turquoise': 0x40E0D0,
+    'violet': 0xEE82EE,
+    'wheat': 0xF5DEB3,
+    'white': 0xFFFFFF,
+    'whitesmoke': 0xF5F5F5,
+    'yellow': 0xFFFF00,
+    'yellowgreen': 0x9ACD32,
+}
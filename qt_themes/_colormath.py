@@ -0,0 +1,613 @@
+"""
+Color math on whole themes or batches of themes at once.
+
+Functions take colors as arrays with the channels in the last axis and work on any
+number of leading axes, e.g. a single color, a theme or a batch of themes. Float colors
+are in the range 0 to 1. With NumPy installed, arrays are NumPy arrays and all
+operations are vectorized. Without NumPy, nested sequences are processed with a
+pure-Python fallback that gives the same results.
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+from collections.abc import Callable, Mapping, Sequence
+from typing import Any, Union
+
+from ._color import Color, _decode_srgb, _encode_srgb
+from ._compact import CompactTheme
+from ._theme import FIELDS, Theme
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+Colors = Any
+ThemeLike = Union[Theme, CompactTheme, Mapping[str, Color]]
+
+USHRT_MAX = 65535
+
+_INDICES = {field: i for i, field in enumerate(FIELDS)}
+
+
+def has_numpy() -> bool:
+    return np is not None
+
+
+# Conversion
+
+
+def theme_array(themes: Sequence[ThemeLike]) -> tuple[Colors, Colors]:
+    """
+    Return the 8-bit RGBA colors of the themes with the shape (themes, fields, 4) and a
+    mask with the shape (themes, fields) of the colors that are set.
+
+    Fields that aren't set are black.
+    """
+
+    rows = []
+    masks = []
+    for theme in themes:
+        if isinstance(theme, Theme):
+            colors = theme.colors()
+        elif isinstance(theme, CompactTheme):
+            colors = theme.colors()
+        else:
+            colors = theme
+        row = [(0, 0, 0, 0)] * len(FIELDS)
+        mask = [False] * len(FIELDS)
+        for name, color in colors.items():
+            row[_INDICES[name]] = tuple(color)
+            mask[_INDICES[name]] = True
+        rows.append(row)
+        masks.append(mask)
+
+    if np is None:
+        return rows, masks
+    return (
+        np.array(rows, dtype=np.uint8).reshape(-1, len(FIELDS), 4),
+        np.array(masks, dtype=bool).reshape(-1, len(FIELDS)),
+    )
+
+
+def field(colors: Colors, name: str) -> Colors:
+    """Return the colors of the field with `name` from a `theme_array()`."""
+
+    i = _INDICES[name]
+    if np is None:
+        return [row[i] for row in colors]
+    return colors[..., i, :]
+
+
+def to_float(colors: Colors) -> Colors:
+    """Return 8-bit RGBA colors as float RGB colors."""
+
+    if np is None:
+        return _map(lambda c: tuple(v / 255 for v in c[:3]), colors)
+    return np.asarray(colors)[..., :3].astype(np.float64) / 255
+
+
+def to_uint8(colors: Colors) -> Colors:
+    """Return float RGB colors as 8-bit colors, rounded and clipped."""
+
+    if np is None:
+        return _map(lambda c: tuple(round(min(max(v, 0), 1) * 255) for v in c), colors)
+    return np.rint(np.clip(np.asarray(colors), 0, 1) * 255).astype(np.uint8)
+
+
+def composite(foreground: Colors, background: Colors) -> Colors:
+    """
+    Return the float RGB colors of 8-bit RGBA `foreground` colors drawn over
+    `background` colors. The alpha of the background is ignored.
+    """
+
+    if np is None:
+        return _zip_map(_composite, foreground, background)
+    foreground = np.asarray(foreground, dtype=np.float64) / 255
+    background = np.asarray(background, dtype=np.float64) / 255
+    alpha = foreground[..., 3:]
+    return foreground[..., :3] * alpha + background[..., :3] * (1 - alpha)
+
+
+# Color spaces
+
+
+def rgb_to_hsv(rgb: Colors) -> Colors:
+    """Return the hue, saturation and value of RGB colors. Hue is in the range 0 to 1."""
+
+    if np is None:
+        return _map(_rgb_to_hsv, rgb)
+    rgb = np.asarray(rgb, dtype=np.float64)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    maximum = rgb.max(axis=-1)
+    delta = maximum - rgb.min(axis=-1)
+    safe_delta = np.where(delta == 0, 1, delta)
+    hue = np.select(
+        (maximum == r, maximum == g),
+        ((g - b) / safe_delta, 2 + (b - r) / safe_delta),
+        4 + (r - g) / safe_delta,
+    )
+    hue = np.where(delta == 0, 0, (hue / 6) % 1)
+    saturation = np.where(maximum == 0, 0, delta / np.where(maximum == 0, 1, maximum))
+    return np.stack((hue, saturation, maximum), axis=-1)
+
+
+def hsv_to_rgb(hsv: Colors) -> Colors:
+    """Return the RGB colors of hue, saturation and value colors."""
+
+    if np is None:
+        return _map(_hsv_to_rgb, hsv)
+    hsv = np.asarray(hsv, dtype=np.float64)
+    h, s, v = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+    return np.stack(
+        [v - v * s * _hsv_channel(h, n) for n in (5, 3, 1)],
+        axis=-1,
+    )
+
+
+def rgb_to_hsl(rgb: Colors) -> Colors:
+    """Return the hue, saturation and lightness of RGB colors."""
+
+    if np is None:
+        return _map(_rgb_to_hsl, rgb)
+    hsv = rgb_to_hsv(rgb)
+    h, s, v = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+    lightness = v * (1 - s / 2)
+    divisor = np.minimum(lightness, 1 - lightness)
+    saturation = np.where(
+        divisor == 0, 0, (v - lightness) / np.where(divisor == 0, 1, divisor)
+    )
+    return np.stack((h, saturation, lightness), axis=-1)
+
+
+def hsl_to_rgb(hsl: Colors) -> Colors:
+    """Return the RGB colors of hue, saturation and lightness colors."""
+
+    if np is None:
+        return _map(_hsl_to_rgb, hsl)
+    hsl = np.asarray(hsl, dtype=np.float64)
+    h, s, lightness = hsl[..., 0], hsl[..., 1], hsl[..., 2]
+    a = s * np.minimum(lightness, 1 - lightness)
+    channels = []
+    for n in (0, 8, 4):
+        k = (n + h * 12) % 12
+        channels.append(lightness - a * np.clip(np.minimum(k - 3, 9 - k), -1, 1))
+    return np.stack(channels, axis=-1)
+
+
+def rgb_to_oklab(rgb: Colors) -> Colors:
+    """Return the OKLab lightness, a and b of RGB colors."""
+
+    if np is None:
+        return _map(lambda c: _rgb_to_oklab(*c[:3]), rgb)
+    linear = _decode_srgb_array(np.asarray(rgb, dtype=np.float64)[..., :3])
+    lms = np.cbrt(linear @ _RGB_TO_LMS.T)
+    return lms @ _LMS_TO_OKLAB.T
+
+
+def oklab_to_rgb(lab: Colors) -> Colors:
+    """Return the RGB colors of OKLab colors, clipped to the sRGB gamut."""
+
+    if np is None:
+        return _map(lambda c: _oklab_to_rgb(*c[:3]), lab)
+    lms = (np.asarray(lab, dtype=np.float64) @ _OKLAB_TO_LMS.T) ** 3
+    return _encode_srgb_array(np.clip(lms @ _LMS_TO_RGB.T, 0, 1))
+
+
+# Operations
+
+
+def mix(a: Colors, b: Colors, t: float | Colors) -> Colors:
+    """Return the RGB colors `t` of the way from `a` to `b`, interpolated in OKLab."""
+
+    if np is None:
+        lab_a = rgb_to_oklab(a)
+        lab_b = rgb_to_oklab(b)
+        return oklab_to_rgb(_zip_map(lambda x, y: _lerp(x, y, t), lab_a, lab_b))
+    lab_a = rgb_to_oklab(a)
+    lab_b = rgb_to_oklab(b)
+    t = np.asarray(t, dtype=np.float64)[..., np.newaxis]
+    return oklab_to_rgb(lab_a + (lab_b - lab_a) * t)
+
+
+def lighten(rgb: Colors, amount: float) -> Colors:
+    """Return the RGB colors with the OKLab lightness increased by `amount`."""
+
+    return _shift_lightness(rgb, amount)
+
+
+def darken(rgb: Colors, amount: float) -> Colors:
+    """Return the RGB colors with the OKLab lightness decreased by `amount`."""
+
+    return _shift_lightness(rgb, -amount)
+
+
+def relative_luminance(rgb: Colors) -> Colors:
+    """Return the WCAG relative luminance of RGB colors."""
+
+    if np is None:
+        return _map(_relative_luminance, rgb)
+    linear = _decode_srgb_array(np.asarray(rgb, dtype=np.float64)[..., :3])
+    return linear @ _LUMINANCE
+
+
+def contrast_ratio(a: Colors, b: Colors) -> Colors:
+    """Return the WCAG contrast ratio between RGB colors, from 1 to 21."""
+
+    if np is None:
+        return _zip_map(_contrast_ratio, a, b)
+    luminance_a = relative_luminance(a)
+    luminance_b = relative_luminance(b)
+    lighter = np.maximum(luminance_a, luminance_b)
+    darker = np.minimum(luminance_a, luminance_b)
+    return (lighter + 0.05) / (darker + 0.05)
+
+
+# Palette derivations
+
+
+def derive_palette_colors(colors: Colors) -> dict[str, Colors]:
+    """
+    Return the colors that `update_palette()` derives for a `theme_array()`.
+
+    The results match the QColor calculations in `update_palette()` exactly:
+
+    - `highlighted_text`: The 8-bit RGBA HighlightedText color.
+    - `bright_text`: The 8-bit RGBA BrightText color.
+    - `is_dark`: Whether the theme is a dark theme.
+    """
+
+    primary = field(colors, 'primary')
+    text = field(colors, 'text')
+    mantle = field(colors, 'mantle')
+    base = field(colors, 'base')
+
+    if np is None:
+        highlighted = [_qt_value(c) > 0.5 for c in primary]
+        return {
+            'highlighted_text': [
+                tuple(m) if h else tuple(t)
+                for h, m, t in zip(highlighted, mantle, text)
+            ],
+            'bright_text': [_qt_bright_text(c) for c in text],
+            'is_dark': [max(t[:3]) > max(b[:3]) for t, b in zip(text, base)],
+        }
+
+    highlighted = _qt_value_array(primary) > np.float32(0.5)
+    return {
+        'highlighted_text': np.where(highlighted[..., np.newaxis], mantle, text),
+        'bright_text': _qt_bright_text_array(text),
+        'is_dark': text[..., :3].max(axis=-1) > base[..., :3].max(axis=-1),
+    }
+
+
+# Pure-Python helpers
+
+
+def _map(function: Callable, colors: Colors) -> Colors:
+    if _is_color(colors):
+        return function(colors)
+    return [_map(function, c) for c in colors]
+
+
+def _zip_map(function: Callable, a: Colors, b: Colors) -> Colors:
+    if _is_color(a):
+        return function(a, b)
+    return [_zip_map(function, x, y) for x, y in zip(a, b)]
+
+
+def _is_color(value: Colors) -> bool:
+    return not value or isinstance(value[0], (int, float))
+
+
+def _composite(
+    foreground: Sequence[int], background: Sequence[int]
+) -> tuple[float, float, float]:
+    alpha = foreground[3] / 255
+    return tuple(
+        (f * alpha + b * (1 - alpha)) / 255
+        for f, b in zip(foreground[:3], background[:3])
+    )
+
+
+def _lerp(a: Sequence[float], b: Sequence[float], t: float) -> tuple[float, ...]:
+    return tuple(x + (y - x) * t for x, y in zip(a, b))
+
+
+def _rgb_to_hsv(rgb: Sequence[float]) -> tuple[float, float, float]:
+    r, g, b = rgb[:3]
+    maximum = max(r, g, b)
+    delta = maximum - min(r, g, b)
+    if delta == 0:
+        hue = 0.0
+    elif maximum == r:
+        hue = ((g - b) / delta / 6) % 1
+    elif maximum == g:
+        hue = (2 + (b - r) / delta) / 6
+    else:
+        hue = (4 + (r - g) / delta) / 6
+    saturation = 0.0 if maximum == 0 else delta / maximum
+    return hue, saturation, maximum
+
+
+def _hsv_to_rgb(hsv: Sequence[float]) -> tuple[float, float, float]:
+    h, s, v = hsv[:3]
+    channels = []
+    for n in (5, 3, 1):
+        k = (n + h * 6) % 6
+        channels.append(v - v * s * max(0, min(k, 4 - k, 1)))
+    return tuple(channels)
+
+
+def _rgb_to_hsl(rgb: Sequence[float]) -> tuple[float, float, float]:
+    h, s, v = _rgb_to_hsv(rgb)
+    lightness = v * (1 - s / 2)
+    divisor = min(lightness, 1 - lightness)
+    saturation = 0.0 if divisor == 0 else (v - lightness) / divisor
+    return h, saturation, lightness
+
+
+def _hsl_to_rgb(hsl: Sequence[float]) -> tuple[float, float, float]:
+    h, s, lightness = hsl[:3]
+    a = s * min(lightness, 1 - lightness)
+    channels = []
+    for n in (0, 8, 4):
+        k = (n + h * 12) % 12
+        channels.append(lightness - a * max(-1, min(k - 3, 9 - k, 1)))
+    return tuple(channels)
+
+
+def _rgb_to_oklab(r: float, g: float, b: float) -> tuple[float, float, float]:
+    linear = [_decode_srgb(c) for c in (r, g, b)]
+    lms = [
+        math.copysign(abs(_dot(row, linear)) ** (1 / 3), _dot(row, linear))
+        for row in _RGB_TO_LMS_ROWS
+    ]
+    return tuple(_dot(row, lms) for row in _LMS_TO_OKLAB_ROWS)
+
+
+def _oklab_to_rgb(lightness: float, a: float, b: float) -> tuple[float, float, float]:
+    lms = [_dot(row, (lightness, a, b)) ** 3 for row in _OKLAB_TO_LMS_ROWS]
+    linear = [min(max(_dot(row, lms), 0), 1) for row in _LMS_TO_RGB_ROWS]
+    return tuple(_encode_srgb(c) for c in linear)
+
+
+def _relative_luminance(rgb: Sequence[float]) -> float:
+    return _dot(_LUMINANCE_ROW, [_decode_srgb(c) for c in rgb[:3]])
+
+
+def _contrast_ratio(a: Sequence[float], b: Sequence[float]) -> float:
+    luminance_a = _relative_luminance(a)
+    luminance_b = _relative_luminance(b)
+    lighter = max(luminance_a, luminance_b)
+    darker = min(luminance_a, luminance_b)
+    return (lighter + 0.05) / (darker + 0.05)
+
+
+def _shift_lightness(rgb: Colors, amount: float) -> Colors:
+    lab = rgb_to_oklab(rgb)
+    if np is None:
+        lab = _map(lambda c: (min(max(c[0] + amount, 0), 1), c[1], c[2]), lab)
+        return oklab_to_rgb(lab)
+    lab[..., 0] = np.clip(lab[..., 0] + amount, 0, 1)
+    return oklab_to_rgb(lab)
+
+
+def _dot(a: Sequence[float], b: Sequence[float]) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+# Emulation of the QColor HSV calculations, which use 16-bit channels and 32-bit
+# floats, so the derived colors match update_palette() exactly.
+
+
+def _f32(value: float) -> float:
+    return struct.unpack('f', struct.pack('f', value))[0]
+
+
+def _qround(value: float) -> int:
+    return int(_f32(value + 0.5)) if value >= 0 else int(_f32(value - 0.5))
+
+
+def _qt_div_257(value: int) -> int:
+    value += 0x80
+    return (value - (value >> 8)) >> 8
+
+
+def _qt_to_hsv(rgba: Sequence[int]) -> tuple[int, int, int, int]:
+    """Returns the 16-bit hue, saturation, value and alpha of QColor.toHsv()."""
+
+    r, g, b = (c * 257 for c in rgba[:3])
+    maximum = max(r, g, b)
+    delta = maximum - min(r, g, b)
+    alpha = rgba[3] * 257
+    if not delta:
+        return USHRT_MAX, 0, maximum, alpha
+
+    saturation = _qround(_f32(_f32(delta / maximum) * USHRT_MAX))
+    if r == maximum:
+        hue = _f32((g - b) / delta)
+    elif g == maximum:
+        hue = _f32(2 + _f32((b - r) / delta))
+    else:
+        hue = _f32(4 + _f32((r - g) / delta))
+    if hue < 0:
+        hue = _f32(hue + 6)
+    return _qround(_f32(hue * 6000)), saturation, maximum, alpha
+
+
+def _qt_hsv_to_rgba(hue: int, saturation: int, value: int, alpha: int) -> tuple:
+    """Returns the 8-bit RGBA of a QColor with the 16-bit HSV values."""
+
+    if saturation == 0 or hue == USHRT_MAX:
+        channel = _qt_div_257(value)
+        return channel, channel, channel, _qt_div_257(alpha)
+
+    h = 0.0 if hue == 36000 else _f32(hue / _f32(6000))
+    s = _f32(saturation / _f32(USHRT_MAX))
+    v = _f32(value / _f32(USHRT_MAX))
+    i = int(h)
+    f = _f32(h - i)
+    p = _f32(v * _f32(1 - s))
+    q = _f32(v * _f32(1 - _f32(s * f)))
+    t = _f32(v * _f32(1 - _f32(s * _f32(1 - f))))
+    rgb = ((v, t, p), (q, v, p), (p, v, t), (p, q, v), (t, p, v), (v, p, q))[i]
+    r, g, b = (_qt_div_257(_qround(_f32(c * USHRT_MAX))) for c in rgb)
+    return r, g, b, _qt_div_257(alpha)
+
+
+def _qt_value(rgba: Sequence[int]) -> float:
+    """Returns QColor.valueF()."""
+
+    return _f32(_qt_to_hsv(rgba)[2] / _f32(USHRT_MAX))
+
+
+def _qt_bright_text(rgba: Sequence[int]) -> tuple[int, int, int, int]:
+    """Returns QColor.fromHsvF(h, s, 1 - v, a) for `color.getHsvF()`."""
+
+    hue, saturation, value, alpha = _qt_to_hsv(rgba)
+    # getHsvF() returns 32-bit floats, fromHsvF() rounds them back to 16-bit.
+    h = -1.0 if hue == USHRT_MAX else _f32(hue / _f32(36000))
+    s = _f32(saturation / _f32(USHRT_MAX))
+    v = _f32(1 - _f32(value / _f32(USHRT_MAX)))
+    a = _f32(alpha / _f32(USHRT_MAX))
+    return _qt_hsv_to_rgba(
+        USHRT_MAX if h == -1 else _qround(_f32(h * 36000)),
+        _qround(_f32(s * USHRT_MAX)),
+        _qround(_f32(v * USHRT_MAX)),
+        _qround(_f32(a * USHRT_MAX)),
+    )
+
+
+# NumPy helpers
+
+
+def _hsv_channel(h, n):
+    k = (n + h * 6) % 6
+    return np.clip(np.minimum(k, 4 - k), 0, 1)
+
+
+def _decode_srgb_array(values):
+    return np.where(
+        values <= 0.04045, values / 12.92, ((values + 0.055) / 1.055) ** 2.4
+    )
+
+
+def _encode_srgb_array(values):
+    return np.where(
+        values <= 0.0031308, values * 12.92, 1.055 * values ** (1 / 2.4) - 0.055
+    )
+
+
+def _qround_array(values):
+    # Only used for positive values.
+    return (values + np.float32(0.5)).astype(np.int64)
+
+
+def _qt_div_257_array(values):
+    values = values + 0x80
+    return (values - (values >> 8)) >> 8
+
+
+def _qt_to_hsv_array(colors):
+    colors = np.asarray(colors, dtype=np.uint8).astype(np.int64) * 257
+    r, g, b = colors[..., 0], colors[..., 1], colors[..., 2]
+    maximum = colors[..., :3].max(axis=-1)
+    delta = maximum - colors[..., :3].min(axis=-1)
+    alpha = colors[..., 3]
+    achromatic = delta == 0
+
+    max_f32 = np.where(achromatic, 1, maximum).astype(np.float32)
+    delta_f32 = np.where(achromatic, 1, delta).astype(np.float32)
+    saturation = _qround_array(delta_f32 / max_f32 * np.float32(USHRT_MAX))
+    hue = np.select(
+        (r == maximum, g == maximum),
+        (
+            (g - b).astype(np.float32) / delta_f32,
+            np.float32(2) + (b - r).astype(np.float32) / delta_f32,
+        ),
+        np.float32(4) + (r - g).astype(np.float32) / delta_f32,
+    ).astype(np.float32)
+    hue = np.where(hue < 0, hue + np.float32(6), hue)
+    hue = np.where(achromatic, USHRT_MAX, _qround_array(hue * np.float32(6000)))
+    saturation = np.where(achromatic, 0, saturation)
+    return hue, saturation, maximum, alpha
+
+
+def _qt_value_array(colors):
+    return _qt_to_hsv_array(colors)[2].astype(np.float32) / np.float32(USHRT_MAX)
+
+
+def _qt_bright_text_array(colors):
+    hue, saturation, value, alpha = _qt_to_hsv_array(colors)
+    max_f32 = np.float32(USHRT_MAX)
+
+    # getHsvF() returns 32-bit floats, fromHsvF() rounds them back to 16-bit.
+    achromatic = hue == USHRT_MAX
+    h = hue.astype(np.float32) / np.float32(36000)
+    hue = np.where(achromatic, USHRT_MAX, _qround_array(h * np.float32(36000)))
+    s = saturation.astype(np.float32) / max_f32
+    saturation = _qround_array(s * max_f32)
+    v = (1 - (value.astype(np.float32) / max_f32).astype(np.float64)).astype(np.float32)
+    value = _qround_array(v * max_f32)
+    a = alpha.astype(np.float32) / max_f32
+    alpha = _qround_array(a * max_f32)
+
+    # QColor.toRgb()
+    h = np.where(hue == 36000, np.float32(0), hue.astype(np.float32) / np.float32(6000))
+    s = saturation.astype(np.float32) / max_f32
+    v = value.astype(np.float32) / max_f32
+    i = h.astype(np.int64)
+    f = h - i.astype(np.float32)
+    one = np.float32(1)
+    p = v * (one - s)
+    q = v * (one - (s * f))
+    t = v * (one - (s * (one - f)))
+    i = np.clip(i, 0, 5)
+    channels = np.stack(
+        (
+            np.choose(i, (v, q, p, p, t, v)),
+            np.choose(i, (t, v, v, q, p, p)),
+            np.choose(i, (p, p, t, v, v, q)),
+        ),
+        axis=-1,
+    )
+    rgb = _qt_div_257_array(_qround_array(channels * max_f32))
+    gray = achromatic | (saturation == 0)
+    rgb = np.where(
+        gray[..., np.newaxis], _qt_div_257_array(value)[..., np.newaxis], rgb
+    )
+    alpha = _qt_div_257_array(alpha)
+    return np.concatenate((rgb, alpha[..., np.newaxis]), axis=-1).astype(np.uint8)
+
+
+_RGB_TO_LMS_ROWS = (
+    (0.4122214708, 0.5363325363, 0.0514459929),
+    (0.2119034982, 0.6806995451, 0.1073969566),
+    (0.0883024619, 0.2817188376, 0.6299787005),
+)
+_LMS_TO_OKLAB_ROWS = (
+    (0.2104542553, 0.7936177850, -0.0040720468),
+    (1.9779984951, -2.4285922050, 0.4505937099),
+    (0.0259040371, 0.7827717662, -0.8086757660),
+)
+_OKLAB_TO_LMS_ROWS = (
+    (1.0, 0.3963377774, 0.2158037573),
+    (1.0, -0.1055613458, -0.0638541728),
+    (1.0, -0.0894841775, -1.2914855480),
+)
+_LMS_TO_RGB_ROWS = (
+    (4.0767416621, -3.3077115913, 0.2309699292),
+    (-1.2684380046, 2.6097574011, -0.3413193965),
+    (-0.0041960863, -0.7034186147, 1.7076147010),
+)
+_LUMINANCE_ROW = (0.2126, 0.7152, 0.0722)
+
+if np is not None:
+    _RGB_TO_LMS = np.array(_RGB_TO_LMS_ROWS)
+    _LMS_TO_OKLAB = np.array(_LMS_TO_OKLAB_ROWS)
+    _OKLAB_TO_LMS = np.array(_OKLAB_TO_LMS_ROWS)
+    _LMS_TO_RGB = np.array(_LMS_TO_RGB_ROWS)
+    _LUMINANCE = np.array(_LUMINANCE_ROW)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Mapping
+
+from ._color import Color
+from ._qt import QtGui
+from ._theme import FIELDS, Theme
+
+_INDICES = {field: i for i, field in enumerate(FIELDS)}
+
+
+class CompactTheme:
+    """
+    An immutable theme that stores all colors in a single array of RGBA values.
+
+    Colors are stored as 0xRRGGBBAA integers in the `Theme` field order, with a bit
+    mask marking the fields that are set. It doesn't require Qt and uses a fraction of
+    the memory of a `Theme`. Compact themes are hashable and can be used as keys.
+
+    Colors are accessed as attributes and returned as `Color`, or as QColor with
+    `qcolor()`.
+    """
+
+    __slots__ = ('_values', '_mask', '_hash')
+
+    def __init__(self, colors: Mapping[str, Color] | None = None) -> None:
+        """
+        :raises TypeError: if a color name is not a Theme field.
+        """
+
+        values = array('I', [0]) * len(FIELDS)
+        mask = 0
+        for name, color in (colors or {}).items():
+            try:
+                i = _INDICES[name]
+            except KeyError:
+                raise TypeError(f'Unexpected theme color {name!r}.') from None
+            r, g, b, a = color
+            values[i] = r << 24 | g << 16 | b << 8 | a
+            mask |= 1 << i
+        self._values = values
+        self._mask = mask
+        self._hash = None
+
+    @classmethod
+    def from_theme(cls, theme: Theme) -> CompactTheme:
+        return cls(theme.colors())
+
+    def to_theme(self) -> Theme:
+        return Theme.from_colors(self.colors())
+
+    def colors(self) -> dict[str, Color]:
+        """Return the colors that are set by name."""
+
+        colors = {}
+        for i, field in enumerate(FIELDS):
+            if self._mask & (1 << i):
+                colors[field] = _unpack(self._values[i])
+        return colors
+
+    def color(self, name: str) -> Color | None:
+        """
+        Return the color with `name` or None if it isn't set.
+
+        :raises AttributeError: if `name` is not a Theme field.
+        """
+
+        try:
+            i = _INDICES[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        if self._mask & (1 << i):
+            return _unpack(self._values[i])
+        return None
+
+    def qcolor(self, name: str) -> QtGui.QColor | None:
+        """
+        Return the color with `name` as QColor or None if it isn't set.
+
+        :raises AttributeError: if `name` is not a Theme field.
+        """
+
+        if (color := self.color(name)) is not None:
+            return QtGui.QColor(*color)
+        return None
+
+    def replace(self, **colors: Color | None) -> CompactTheme:
+        """Return a copy of the theme with the given colors replaced or unset."""
+
+        theme = self.colors()
+        for name, color in colors.items():
+            if color is None:
+                theme.pop(name, None)
+            else:
+                theme[name] = color
+        return CompactTheme(theme)
+
+    def is_dark_theme(self) -> bool:
+        return self.text.value() > self.base.value()
+
+    def __getattr__(self, name: str) -> Color | None:
+        return self.color(name)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        if name in CompactTheme.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            raise AttributeError(f'{self.__class__.__name__} is immutable.')
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompactTheme):
+            return NotImplemented
+        return self._mask == other._mask and self._values == other._values
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash((self._mask, self._values.tobytes()))
+        return self._hash
+
+    def __repr__(self) -> str:
+        colors = ', '.join(f'{k}={v.name()!r}' for k, v in self.colors().items())
+        return f'{self.__class__.__name__}({colors})'
+
+    def __getstate__(self) -> tuple[int, bytes]:
+        return self._mask, self._values.tobytes()
+
+    def __setstate__(self, state: tuple[int, bytes]) -> None:
+        mask, data = state
+        values = array('I')
+        values.frombytes(data)
+        self._values = values
+        self._mask = mask
+        self._hash = None
+
+
+def _unpack(value: int) -> Color:
+    return Color(value >> 24, (value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF)
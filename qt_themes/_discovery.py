@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from json import JSONDecodeError
+
+from ._theme import Theme, _find_theme_paths, _registry, logger
+
+
+class ThemeCatalog(Mapping):
+    """
+    A read-only mapping of theme names to themes that parses themes on access.
+
+    The names and source paths come from the directory listing alone. A theme file is
+    only read the first time the theme is accessed, after that it is served from the
+    theme cache. The value of a theme with an invalid file is None, the same as
+    `get_theme()` returns for it.
+    """
+
+    def __init__(self, paths: Mapping[str, str]) -> None:
+        self._paths = dict(paths)
+
+    def __getitem__(self, name: str) -> Theme | None:
+        path = self._paths[name]
+        try:
+            return Theme.from_colors(_registry.load(path))
+        except (JSONDecodeError, TypeError):
+            logger.warning(f'Invalid theme {path!r}.')
+        except FileNotFoundError:
+            logger.warning(f'Cannot find theme {path!r}.')
+        return None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._paths
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({list(self._paths)!r})'
+
+    @property
+    def paths(self) -> dict[str, str]:
+        """Return the source path of each theme by name."""
+
+        return dict(self._paths)
+
+    def path(self, name: str) -> str:
+        """
+        Return the source path of the theme with `name`.
+
+        :raises KeyError: if no theme with `name` was found.
+        """
+
+        return self._paths[name]
+
+
+def discover_themes() -> ThemeCatalog:
+    """
+    Return all themes found on disk without reading any of the theme files.
+
+    Themes in later search paths shadow themes with the same name in earlier ones,
+    the same as in `get_themes()`.
+    """
+
+    return ThemeCatalog(_find_theme_paths())
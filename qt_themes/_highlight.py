@@ -0,0 +1,205 @@
+"""
+Syntax highlighting with the accent colors of a theme.
+
+Token types such as `keyword` or `string` are mapped to theme fields by
+`TOKEN_STYLES`. The QTextCharFormats of all token types are built once per theme and
+shared by all highlighters, so highlighting a block only looks up formats.
+"""
+
+from __future__ import annotations
+
+import logging
+import types
+from collections.abc import Iterator, Mapping
+from typing import NamedTuple
+
+from ._cache import CacheInfo, LRUCache
+from ._qt import QtCore, QtGui, QtWidgets
+from ._theme import Theme, _theme_key, get_theme
+
+TEXT_FORMAT_CACHE_SIZE = 32
+
+logger = logging.getLogger(__package__)
+
+
+class TokenStyle(NamedTuple):
+    field: str
+    bold: bool = False
+    italic: bool = False
+
+
+TOKEN_STYLES = {
+    'text': TokenStyle('text'),
+    'keyword': TokenStyle('magenta'),
+    'builtin': TokenStyle('red'),
+    'type': TokenStyle('yellow'),
+    'function': TokenStyle('blue'),
+    'decorator': TokenStyle('orange'),
+    'string': TokenStyle('green'),
+    'escape': TokenStyle('cyan'),
+    'number': TokenStyle('orange'),
+    'constant': TokenStyle('orange'),
+    'operator': TokenStyle('cyan'),
+    'punctuation': TokenStyle('overlay2'),
+    'comment': TokenStyle('overlay1', italic=True),
+    'error': TokenStyle('red', bold=True),
+}
+
+
+def get_highlight_colors(theme: Theme) -> dict[str, QtGui.QColor]:
+    """
+    Return the color of each token type of `TOKEN_STYLES` for `theme`.
+
+    Token types whose field isn't set in the theme use the text color.
+    """
+
+    colors = {}
+    for token, style in TOKEN_STYLES.items():
+        color = getattr(theme, style.field) or theme.text
+        if color is not None:
+            colors[token] = QtGui.QColor(color)
+    return colors
+
+
+def get_text_formats(
+    theme: Theme | str | None = None,
+) -> Mapping[str, QtGui.QTextCharFormat]:
+    """
+    Return the QTextCharFormat of each token type for `theme`.
+
+    If no theme is provided, the current theme of the QApplication is used. The formats
+    are built once per theme and shared, they must not be modified.
+    """
+
+    if theme is None or isinstance(theme, str):
+        theme = get_theme(theme) or Theme()
+    return _text_format_cache.get(_theme_key(theme), lambda: _text_formats(theme))
+
+
+def text_format_cache_info() -> CacheInfo:
+    """Return the hit and miss counters of the text format cache."""
+
+    return _text_format_cache.info()
+
+
+class ThemeHighlighter(QtGui.QSyntaxHighlighter):
+    """
+    A syntax highlighter that highlights with the text formats of a theme.
+
+    Subclasses implement `highlightBlock()` and look up the format of a token type in
+    `formats`, e.g. `self.setFormat(start, length, self.formats['keyword'])`. Read
+    `formats` once per block, a theme change replaces the whole table at once.
+
+    Without a theme, the highlighter follows the theme of the QApplication. If the
+    highlighter is created for a QPlainTextEdit or QTextEdit, a theme change only
+    highlights the visible blocks again, the other blocks are highlighted again once
+    they are scrolled into view.
+    """
+
+    def __init__(
+        self,
+        parent: QtGui.QTextDocument | QtWidgets.QPlainTextEdit | QtWidgets.QTextEdit,
+        theme: Theme | str | None = None,
+    ) -> None:
+        editor = None
+        if isinstance(parent, (QtWidgets.QPlainTextEdit, QtWidgets.QTextEdit)):
+            editor = parent
+            parent = parent.document()
+        super().__init__(parent)
+
+        self._editor = editor
+        self._theme = theme
+        self._follow_pending = False
+        # Numbers of the blocks that were highlighted since the formats changed.
+        self._highlighted: set[int] | None = None
+        self.formats = get_text_formats(theme)
+
+        if editor is not None:
+            editor.verticalScrollBar().valueChanged.connect(self._scrolled)
+            parent.blockCountChanged.connect(self._block_count_changed)
+        if application := QtGui.QGuiApplication.instance():
+            application.paletteChanged.connect(self._palette_changed)
+
+    def set_theme(self, theme: Theme | str | None) -> None:
+        """Set the theme of the highlighter, or follow the application theme if None."""
+
+        self._theme = theme
+        self._update_formats()
+
+    def rehighlight_visible(self) -> None:
+        """
+        Highlight the visible blocks of the editor again that weren't highlighted
+        since the formats changed. Without an editor, all blocks are highlighted again.
+        """
+
+        if self._editor is None:
+            self._highlighted = None
+            self.rehighlight()
+            return
+        if self._highlighted is None:
+            return
+
+        for block in self._visible_blocks():
+            number = block.blockNumber()
+            if number not in self._highlighted:
+                self.rehighlightBlock(block)
+                self._highlighted.add(number)
+        if len(self._highlighted) >= self.document().blockCount():
+            self._highlighted = None
+
+    def _update_formats(self) -> None:
+        formats = get_text_formats(self._theme)
+        if formats is self.formats:
+            return
+        self.formats = formats
+        self._highlighted = set()
+        self.rehighlight_visible()
+
+    def _visible_blocks(self) -> Iterator[QtGui.QTextBlock]:
+        viewport = self._editor.viewport()
+        bottom_right = QtCore.QPoint(viewport.width() - 1, viewport.height() - 1)
+        last = self._editor.cursorForPosition(bottom_right).blockNumber()
+        block = self._editor.cursorForPosition(QtCore.QPoint(0, 0)).block()
+        while block.isValid() and block.blockNumber() <= last:
+            yield block
+            block = block.next()
+
+    def _palette_changed(self, *args) -> None:
+        # The palette is applied before the theme of the application is set.
+        if self._theme is None and not self._follow_pending:
+            self._follow_pending = True
+            QtCore.QTimer.singleShot(0, self._follow)
+
+    def _follow(self) -> None:
+        self._follow_pending = False
+        if self._theme is None:
+            self._update_formats()
+
+    def _scrolled(self, *args) -> None:
+        if self._highlighted is not None:
+            self.rehighlight_visible()
+
+    def _block_count_changed(self, *args) -> None:
+        # Block numbers shifted, so any block could still have the previous formats.
+        if self._highlighted is not None:
+            self._highlighted.clear()
+
+
+def _text_formats(theme: Theme) -> Mapping[str, QtGui.QTextCharFormat]:
+    colors = get_highlight_colors(theme)
+    formats = {}
+    for token, style in TOKEN_STYLES.items():
+        text_format = QtGui.QTextCharFormat()
+        if color := colors.get(token):
+            text_format.setForeground(color)
+        if style.bold:
+            text_format.setFontWeight(QtGui.QFont.Weight.Bold)
+        if style.italic:
+            text_format.setFontItalic(True)
+        formats[token] = text_format
+    return types.MappingProxyType(formats)
+
+
+_text_format_cache: LRUCache[Mapping[str, QtGui.QTextCharFormat]] = LRUCache(
+    TEXT_FORMAT_CACHE_SIZE
+)
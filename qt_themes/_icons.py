@@ -0,0 +1,195 @@
+"""
+Icons recolored with the colors of the current theme.
+
+Monochrome icons, such as SVG toolbar icons or alpha masks, are tinted with the color
+of a palette role in the group that matches the icon mode. Tinted pixmaps are stored in
+the QPixmapCache, which evicts the least recently used pixmaps once its limit is reached.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from ._cache import CacheInfo
+from ._qt import QtCore, QtGui
+from ._theme import Theme, _theme_key, get_palette, get_theme
+
+logger = logging.getLogger(__package__)
+
+_KEY_PREFIX = 'qt_themes.icon'
+
+# Keys of the pixmaps in the QPixmapCache and the theme they were tinted for.
+_keys: set[str] = set()
+_theme: Theme | None = None
+_theme_hash = 0
+_hits = 0
+_misses = 0
+
+
+class ThemeIconEngine(QtGui.QIconEngine):
+    """
+    An icon engine that tints the pixmaps of an icon with a color of the theme.
+
+    The color is taken from the palette that `update_palette()` builds for the current
+    theme: `role` in the Disabled group for disabled icons, HighlightedText for
+    selected icons and `role` in the Active group otherwise. SVG icons are rendered at
+    the requested size before they are tinted, so they stay sharp at any scale.
+    Without a theme, the pixmaps of the icon are returned unchanged.
+    """
+
+    def __init__(
+        self,
+        icon: QtGui.QIcon | str,
+        role: QtGui.QPalette.ColorRole | None = None,
+    ) -> None:
+        super().__init__()
+
+        if isinstance(icon, str):
+            self._key = icon
+            icon = QtGui.QIcon(icon)
+        else:
+            self._key = str(icon.cacheKey())
+        self._icon = icon
+        self._role = role or QtGui.QPalette.ColorRole.WindowText
+
+    def clone(self) -> ThemeIconEngine:
+        engine = ThemeIconEngine(self._icon, self._role)
+        engine._key = self._key
+        return engine
+
+    def actualSize(
+        self, size: QtCore.QSize, mode: QtGui.QIcon.Mode, state: QtGui.QIcon.State
+    ) -> QtCore.QSize:
+        return self._icon.actualSize(size, mode, state)
+
+    def availableSizes(
+        self,
+        mode: QtGui.QIcon.Mode = QtGui.QIcon.Mode.Normal,
+        state: QtGui.QIcon.State = QtGui.QIcon.State.Off,
+    ) -> list[QtCore.QSize]:
+        return self._icon.availableSizes(mode, state)
+
+    def paint(
+        self,
+        painter: QtGui.QPainter,
+        rect: QtCore.QRect,
+        mode: QtGui.QIcon.Mode,
+        state: QtGui.QIcon.State,
+    ) -> None:
+        scale = painter.device().devicePixelRatioF()
+        pixmap = self.scaledPixmap(rect.size(), mode, state, scale)
+        painter.drawPixmap(rect, pixmap)
+
+    def pixmap(
+        self, size: QtCore.QSize, mode: QtGui.QIcon.Mode, state: QtGui.QIcon.State
+    ) -> QtGui.QPixmap:
+        return self.scaledPixmap(size, mode, state, 1.0)
+
+    def scaledPixmap(
+        self,
+        size: QtCore.QSize,
+        mode: QtGui.QIcon.Mode,
+        state: QtGui.QIcon.State,
+        scale: float,
+    ) -> QtGui.QPixmap:
+        global _hits, _misses
+
+        theme = get_theme()
+        if theme is None:
+            return self._source_pixmap(size, mode, state, scale)
+
+        theme_hash = _current_theme_hash(theme)
+        key = (
+            f'{_KEY_PREFIX}:{self._key}:{size.width()}x{size.height()}@{scale}:'
+            f'{mode.name}:{state.name}:{self._role.name}:{theme_hash:x}'
+        )
+        if (pixmap := QtGui.QPixmapCache.find(key)) is not None:
+            _hits += 1
+            return pixmap
+        _misses += 1
+
+        pixmap = self._source_pixmap(size, QtGui.QIcon.Mode.Normal, state, scale)
+        if not pixmap.isNull():
+            painter = QtGui.QPainter(pixmap)
+            painter.setCompositionMode(
+                QtGui.QPainter.CompositionMode.CompositionMode_SourceIn
+            )
+            painter.fillRect(pixmap.rect(), self._color(theme, mode))
+            painter.end()
+            if QtGui.QPixmapCache.insert(key, pixmap):
+                _keys.add(key)
+        return pixmap
+
+    def _color(self, theme: Theme, mode: QtGui.QIcon.Mode) -> QtGui.QColor:
+        ColorGroup = QtGui.QPalette.ColorGroup
+        palette = get_palette(theme)
+        if mode == QtGui.QIcon.Mode.Disabled:
+            return palette.color(ColorGroup.Disabled, self._role)
+        if mode == QtGui.QIcon.Mode.Selected:
+            return palette.color(
+                ColorGroup.Active, QtGui.QPalette.ColorRole.HighlightedText
+            )
+        return palette.color(ColorGroup.Active, self._role)
+
+    def _source_pixmap(
+        self,
+        size: QtCore.QSize,
+        mode: QtGui.QIcon.Mode,
+        state: QtGui.QIcon.State,
+        scale: float,
+    ) -> QtGui.QPixmap:
+        try:
+            return self._icon.pixmap(size, scale, mode, state)
+        except TypeError:
+            # PySide2 compatibility
+            pixmap = self._icon.pixmap(size * scale, mode, state)
+            pixmap.setDevicePixelRatio(scale)
+            return pixmap
+
+
+def themed_icon(
+    icon: QtGui.QIcon | str, role: QtGui.QPalette.ColorRole | None = None
+) -> QtGui.QIcon:
+    """
+    Return an icon that follows the current theme.
+
+    :param icon: An icon or the path of an SVG or image file with an alpha mask.
+    :param role: The palette role of the color, WindowText by default.
+    """
+
+    return QtGui.QIcon(ThemeIconEngine(icon, role))
+
+
+def icon_cache_info() -> CacheInfo:
+    """
+    Return the hit and miss counters of the recolored icons, the QPixmapCache limit in
+    KB and the number of pixmaps cached for the current theme.
+    """
+
+    # Pixmaps that the QPixmapCache evicted are no longer counted.
+    _keys.difference_update(
+        [key for key in _keys if QtGui.QPixmapCache.find(key) is None]
+    )
+    return CacheInfo(_hits, _misses, QtGui.QPixmapCache.cacheLimit(), len(_keys))
+
+
+def _current_theme_hash(theme: Theme) -> int:
+    """
+    Returns the hash of the colors of the current theme.
+
+    When the theme changed since the last call, e.g. with `set_theme()`, the pixmaps
+    tinted for the previous theme are removed from the QPixmapCache.
+    """
+
+    global _theme, _theme_hash
+
+    if theme is not _theme:
+        theme_hash = hash(_theme_key(theme)) & 0xFFFFFFFFFFFFFFFF
+        if theme_hash != _theme_hash:
+            for key in _keys:
+                QtGui.QPixmapCache.remove(key)
+            _keys.clear()
+            logger.debug('Removed recolored icons of the previous theme.')
+        _theme = theme
+        _theme_hash = theme_hash
+    return _theme_hash
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from concurrent.futures import Executor, Future
+
+from ._async import load_theme, load_themes
+from ._qt import QtCore
+from ._theme import Theme
+
+logger = logging.getLogger(__package__)
+
+
+class ThemeLoader(QtCore.QObject):
+    """
+    Load themes in the background and emit signals on the main thread.
+
+    The signals are emitted from the worker threads and delivered to receivers in the
+    main thread with queued connections.
+    """
+
+    theme_loaded: QtCore.Signal = QtCore.Signal(str, object)
+    themes_loaded: QtCore.Signal = QtCore.Signal(dict)
+
+    def __init__(
+        self,
+        parent: QtCore.QObject | None = None,
+        executor: Executor | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._executor = executor
+
+    def load_theme(self, name: str) -> Future[Theme | None]:
+        """Load the theme with `name` and emit `theme_loaded` if it is valid."""
+
+        future = load_theme(name, self._executor)
+
+        def loaded(f: Future[Theme | None]) -> None:
+            if not f.exception() and (theme := f.result()) is not None:
+                self.theme_loaded.emit(name, theme)
+
+        future.add_done_callback(loaded)
+        return future
+
+    def load_themes(self) -> Future[dict[str, Theme]]:
+        """
+        Load all valid themes, emit `theme_loaded` for each theme and `themes_loaded`
+        once all themes are loaded.
+        """
+
+        future = load_themes(self._executor, callback=self.theme_loaded.emit)
+
+        def loaded(f: Future[dict[str, Theme]]) -> None:
+            if exception := f.exception():
+                logger.warning(f'Cannot load themes: {exception}')
+            else:
+                self.themes_loaded.emit(f.result())
+
+        future.add_done_callback(loaded)
+        return future
+
+
+class _Dispatcher(QtCore.QObject):
+    called: QtCore.Signal = QtCore.Signal(object)
+
+    def __init__(self, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self.called.connect(self._call)
+
+    @QtCore.Slot(object)
+    def _call(self, function: Callable[[], None]) -> None:
+        function()
+
+
+def call_in_main_thread(function: Callable[[], None]) -> None:
+    """
+    Call `function` in the thread of the QApplication.
+
+    If the current thread is the main thread, `function` is called immediately.
+    """
+
+    application = QtCore.QCoreApplication.instance()
+    if application is None:
+        return
+    if QtCore.QThread.currentThread() == application.thread():
+        function()
+        return
+
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = _Dispatcher()
+        _dispatcher.moveToThread(application.thread())
+    _dispatcher.called.emit(function)
+
+
+_dispatcher: _Dispatcher | None = None
@@ -0,0 +1,139 @@
+"""
+Opt-in timing of theme operations.
+
+Profiling is enabled while at least one sink is added. Sinks are called with a `Span`
+for every timed operation, from the thread that ran the operation:
+
+- `discover`: listing the theme files in the search paths.
+- `parse`: reading and parsing a theme file, the detail is the path.
+- `build_palette`: building a QPalette for a theme.
+- `apply_palette`: setting the palette for the QApplication.
+
+Counters such as the number of scanned files and cache hits are only counted while
+profiling is enabled. Without sinks, the instrumentation only checks a list.
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import NamedTuple
+
+logger = logging.getLogger(__package__)
+
+_lock = threading.Lock()
+_sinks: list[Callable[[Span], None]] = []
+_counters: collections.Counter[str] = collections.Counter()
+_null_span = contextlib.nullcontext()
+
+
+class Span(NamedTuple):
+    name: str
+    seconds: float
+    detail: str | None = None
+
+
+class Profiler:
+    """
+    A sink that records spans, for example to log the time of a theme switch.
+
+    Use as a context manager to profile the operations in the block:
+
+        with Profiler() as profiler:
+            qt_themes.set_theme('nord')
+        print(profiler.totals())
+    """
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def __enter__(self) -> Profiler:
+        add_profiling_sink(self)
+        return self
+
+    def __exit__(self, *args) -> None:
+        remove_profiling_sink(self)
+
+    def totals(self) -> dict[str, float]:
+        """Return the total seconds of the spans by name."""
+
+        totals: dict[str, float] = {}
+        with self._lock:
+            for span in self.spans:
+                totals[span.name] = totals.get(span.name, 0) + span.seconds
+        return totals
+
+
+def add_profiling_sink(sink: Callable[[Span], None]) -> None:
+    """Add a callable that is called with every timed `Span` and enable profiling."""
+
+    with _lock:
+        _sinks.append(sink)
+
+
+def remove_profiling_sink(sink: Callable[[Span], None]) -> None:
+    """Remove a sink, profiling is disabled once the last sink is removed."""
+
+    with _lock:
+        if sink in _sinks:
+            _sinks.remove(sink)
+
+
+def profiling_counters() -> dict[str, int]:
+    """Return the counters recorded while profiling was enabled."""
+
+    with _lock:
+        return dict(_counters)
+
+
+def reset_profiling_counters() -> None:
+    with _lock:
+        _counters.clear()
+
+
+def span(name: str, detail: str | None = None) -> contextlib.AbstractContextManager:
+    """Return a context manager that reports the time of its block to the sinks."""
+
+    if not _sinks:
+        return _null_span
+    return _Span(name, detail)
+
+
+def count(name: str, value: int = 1) -> None:
+    """Increment the counter `name` if profiling is enabled."""
+
+    if _sinks:
+        with _lock:
+            _counters[name] += value
+
+
+class _Span:
+    __slots__ = ('name', 'detail', 'start')
+
+    def __init__(self, name: str, detail: str | None) -> None:
+        self.name = name
+        self.detail = detail
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *args) -> None:
+        result = Span(self.name, time.perf_counter() - self.start, self.detail)
+        with _lock:
+            sinks = tuple(_sinks)
+        for sink in sinks:
+            # A failing sink must not break the theme operation.
+            try:
+                sink(result)
+            except Exception as e:
+                logger.warning(f'Profiling sink failed: {e}')
@@ -0,0 +1,61 @@
+"""
+Deferred imports of the Qt bindings.
+
+The modules in this file are placeholders that import the real Qt module on first
+attribute access, so importing qt_themes doesn't load Qt until it is actually used.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+import types
+from typing import TYPE_CHECKING
+
+BINDINGS = ('PySide6', 'PySide2')
+
+_binding: str | None = None
+
+
+class _DeferredModule(types.ModuleType):
+    def __getattr__(self, name: str) -> object:
+        if name.startswith('__'):
+            raise AttributeError(name)
+        value = getattr(_import(self.__name__), name)
+        # Cache the attribute so later lookups don't go through __getattr__.
+        setattr(self, name, value)
+        return value
+
+    def __repr__(self) -> str:
+        return f'<deferred module {self.__name__!r}>'
+
+
+def is_loaded() -> bool:
+    """Return whether any Qt binding has been imported in this process."""
+
+    return any(f'{binding}.QtCore' in sys.modules for binding in BINDINGS)
+
+
+def _import(name: str) -> types.ModuleType:
+    global _binding
+    if _binding is None:
+        # Prefer a binding that is already imported by the application.
+        bindings = sorted(BINDINGS, key=lambda b: f'{b}.QtCore' not in sys.modules)
+        for binding in bindings:
+            try:
+                importlib.import_module(f'{binding}.QtCore')
+            except ImportError:
+                continue
+            _binding = binding
+            break
+        else:
+            raise ImportError(f'Cannot import any Qt binding: {", ".join(BINDINGS)}')
+    return importlib.import_module(f'{_binding}.{name}')
+
+
+if TYPE_CHECKING:
+    from PySide6 import QtCore, QtGui, QtWidgets
+else:
+    QtCore = _DeferredModule('QtCore')
+    QtGui = _DeferredModule('QtGui')
+    QtWidgets = _DeferredModule('QtWidgets')
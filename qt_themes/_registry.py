@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+from . import _profiling
+
+T = TypeVar('T')
+
+
+class ThemeRegistry(Generic[T]):
+    """
+    Process-wide cache of parsed theme files.
+
+    Entries are keyed by path and validated against the file's mtime and size, so a
+    file is only parsed again after it changed on disk. Directory listings are cached
+    the same way using the directory's mtime.
+
+    Values are returned through their `copy()` method so callers can't modify the
+    cached objects.
+
+    If a value also depends on other files or directories, `dependencies` returns
+    their paths when the value is loaded. The entry is then also validated against
+    these paths, without resolving the dependencies again.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], T],
+        dependencies: Callable[[str], tuple[str, ...]] | None = None,
+    ) -> None:
+        self._loader = loader
+        self._dependencies = dependencies
+        self._lock = threading.RLock()
+        self._files: dict[str, tuple[tuple, tuple[str, ...], T]] = {}
+        self._dirs: dict[str, tuple[int, tuple[str, ...]]] = {}
+
+    def load(self, path: str) -> T:
+        """
+        Return the value for the file at `path`, parsing it only if it has changed.
+
+        :raises FileNotFoundError: if the file cannot be found.
+        """
+
+        with self._lock:
+            entry = self._files.get(path)
+        if entry is None or entry[0] != _stat_key(path, entry[1]):
+            _profiling.count('theme_cache_misses')
+            dependencies = ()
+            if self._dependencies is not None:
+                dependencies = self._dependencies(path)
+            key = _stat_key(path, dependencies)
+            # Files are parsed outside the lock so threads can load files in parallel.
+            entry = (key, dependencies, self._loader(path))
+            with self._lock:
+                self._files[path] = entry
+        else:
+            _profiling.count('theme_cache_hits')
+        return entry[2].copy()
+
+    def list_dir(self, path: str) -> tuple[str, ...]:
+        """
+        Return the sorted file names in the directory at `path`.
+
+        Returns an empty tuple if the directory doesn't exist.
+        """
+
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            with self._lock:
+                self._dirs.pop(path, None)
+            return ()
+
+        with self._lock:
+            entry = self._dirs.get(path)
+        if entry is None or entry[0] != mtime:
+            try:
+                file_names = tuple(sorted(os.listdir(path)))
+            except OSError:
+                file_names = ()
+            entry = (mtime, file_names)
+            with self._lock:
+                self._dirs[path] = entry
+        return entry[1]
+
+    def invalidate(self, path: str | None = None) -> None:
+        """
+        Remove the cached entry for `path`, or all entries if no path is provided.
+        """
+
+        with self._lock:
+            if path is None:
+                self._files.clear()
+                self._dirs.clear()
+            else:
+                self._files.pop(path, None)
+                self._dirs.pop(path, None)
+                self._dirs.pop(os.path.dirname(path), None)
+
+
+def _stat_key(path: str, dependencies: tuple[str, ...] = ()) -> tuple[int, ...]:
+    """
+    Returns the mtime and size of `path` and its dependencies.
+
+    :raises FileNotFoundError: if the file at `path` cannot be found.
+    """
+
+    stat = os.stat(path)
+    key = [stat.st_mtime_ns, stat.st_size]
+    for dependency in dependencies:
+        try:
+            stat = os.stat(dependency)
+        except OSError:
+            key.extend((-1, -1))
+            continue
+        key.extend((stat.st_mtime_ns, stat.st_size))
+    return tuple(key)
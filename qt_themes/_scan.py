@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import collections
+import dataclasses
+import logging
+import threading
+import time
+from json import JSONDecodeError
+
+from . import _profiling
+from ._color import Color
+from ._theme import Theme, _get_paths, _list_theme_files, _registry
+
+logger = logging.getLogger(__package__)
+
+
+@dataclasses.dataclass
+class ScanResult:
+    """The themes found by `scan_themes()` and a report of the scan."""
+
+    # Colors of all valid themes by name.
+    colors: dict[str, dict[str, Color]] = dataclasses.field(default_factory=dict)
+    # Source path of each valid theme by name.
+    paths: dict[str, str] = dataclasses.field(default_factory=dict)
+    # Seconds spent listing and parsing each search path.
+    timings: dict[str, float] = dataclasses.field(default_factory=dict)
+    # Search paths that didn't finish before the timeout.
+    timed_out: list[str] = dataclasses.field(default_factory=list)
+    # Invalid theme files with the error.
+    errors: dict[str, str] = dataclasses.field(default_factory=dict)
+
+    def themes(self) -> dict[str, Theme]:
+        """Return all valid themes, the same as `get_themes()`."""
+
+        return {name: Theme.from_colors(c) for name, c in self.colors.items()}
+
+
+@dataclasses.dataclass
+class _PathResult:
+    themes: list[tuple[str, str, dict[str, Color]]]
+    errors: dict[str, str]
+    duration: float
+
+
+def scan_themes(
+    paths: tuple[str, ...] | None = None,
+    max_workers: int | None = None,
+    timeout: float | None = None,
+) -> ScanResult:
+    """
+    List and parse all search paths concurrently.
+
+    Each search path is scanned on its own worker thread, so the total time is that of
+    the slowest path instead of the sum of all paths. Themes in later search paths
+    shadow themes with the same name in earlier ones, the same as in `get_themes()`.
+
+    :param paths: The search paths, by default the same paths as `get_themes()`.
+    :param max_workers: The number of worker threads, by default one per path.
+    :param timeout: The seconds to wait for each search path, from the time its scan
+        starts. Paths that don't finish in time are skipped and reported in
+        `ScanResult.timed_out`, as are paths that can't start because every worker is
+        blocked by a path that timed out. The workers are daemon threads, so a hung
+        path doesn't keep the process from exiting.
+    """
+
+    if paths is None:
+        paths = _get_paths()
+    result = ScanResult()
+    unique_paths = tuple(dict.fromkeys(paths))
+    if not unique_paths:
+        return result
+
+    workers = min(max_workers or len(unique_paths), len(unique_paths))
+    path_results, timed_out = _scan_paths(unique_paths, workers, timeout)
+    for path in unique_paths:
+        if (duration := timed_out.get(path)) is None:
+            continue
+        logger.warning(f'Timed out scanning themes path {path!r}.')
+        result.timed_out.append(path)
+        result.timings[path] = duration
+
+    for path in paths:
+        if (path_result := path_results.get(path)) is None:
+            continue
+        result.timings[path] = path_result.duration
+        result.errors.update(path_result.errors)
+        for name, theme_path, colors in path_result.themes:
+            result.colors[name] = colors
+            result.paths[name] = theme_path
+    return result
+
+
+def _scan_paths(
+    paths: tuple[str, ...], workers: int, timeout: float | None
+) -> tuple[dict[str, _PathResult], dict[str, float]]:
+    """
+    Returns the results of the paths that finished and the seconds spent on each path
+    that timed out.
+    """
+
+    queue = collections.deque(paths)
+    condition = threading.Condition()
+    starts: dict[str, float] = {}
+    outcomes: dict[str, _PathResult | BaseException] = {}
+
+    def work() -> None:
+        while True:
+            with condition:
+                if not queue:
+                    return
+                path = queue.popleft()
+                starts[path] = time.perf_counter()
+            try:
+                outcome = _scan_path(path)
+            except BaseException as e:
+                outcome = e
+            with condition:
+                outcomes[path] = outcome
+                condition.notify_all()
+
+    for _ in range(workers):
+        threading.Thread(target=work, name='qt_themes_scan', daemon=True).start()
+
+    timed_out: dict[str, float] = {}
+    with condition:
+        while True:
+            now = time.perf_counter()
+            running = [p for p in starts if p not in outcomes and p not in timed_out]
+            deadline = None
+            if timeout is not None:
+                for path in running:
+                    # Each path has its own deadline from the time its scan started.
+                    if now - starts[path] >= timeout:
+                        timed_out[path] = now - starts[path]
+                    elif deadline is None or starts[path] + timeout < deadline:
+                        deadline = starts[path] + timeout
+                hung = sum(p not in outcomes for p in timed_out)
+                if hung >= workers:
+                    # Queued paths can't start until a path that timed out finishes.
+                    for path in queue:
+                        timed_out[path] = 0.0
+                    queue.clear()
+            if all(p in outcomes or p in timed_out for p in paths):
+                break
+            condition.wait(None if deadline is None else deadline - now)
+
+    results = {}
+    for path, outcome in outcomes.items():
+        if path in timed_out:
+            continue
+        if isinstance(outcome, BaseException):
+            raise outcome
+        results[path] = outcome
+    return results, timed_out
+
+
+def _scan_path(themes_path: str) -> _PathResult:
+    """Returns the valid themes of a single search path in listing order."""
+
+    start = time.perf_counter()
+    themes = []
+    errors = {}
+    with _profiling.span('discover', themes_path):
+        theme_files = list(_list_theme_files(themes_path))
+    for name, path in theme_files:
+        try:
+            colors = _registry.load(path)
+        except (JSONDecodeError, TypeError) as e:
+            logger.warning(f'Invalid theme {path!r}.')
+            errors[path] = str(e)
+            continue
+        except FileNotFoundError:
+            continue
+        themes.append((name, path, colors))
+    return _PathResult(themes, errors, time.perf_counter() - start)
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import collections
+import logging
+import time
+from typing import NamedTuple
+
+from ._qt import QtCore, QtGui, QtWidgets
+from ._theme import Theme, get_palette, get_theme
+
+TIMINGS_SIZE = 256
+
+logger = logging.getLogger(__package__)
+
+
+class PropagationTiming(NamedTuple):
+    widget: str
+    seconds: float
+    skipped: bool
+
+
+def set_widget_theme(
+    widget: QtWidgets.QWidget, theme: Theme | str | None
+) -> PropagationTiming:
+    """
+    Set the theme for `widget` and its children only.
+
+    Unlike `set_theme()`, the palette change is only propagated to the widget subtree
+    instead of every widget of the application. If the widget already has the palette
+    of the theme, nothing is changed. If `theme` is None, the widget uses the palette of
+    its parent again.
+    """
+
+    name = widget.objectName() or type(widget).__name__
+    start = time.perf_counter()
+
+    if isinstance(theme, str):
+        theme = get_theme(theme)
+        if not theme:
+            return PropagationTiming(name, time.perf_counter() - start, True)
+
+    # Widgets without their own palette follow the application palette, so they still
+    # need the palette set even if it is currently the same.
+    has_palette = widget.testAttribute(QtCore.Qt.WidgetAttribute.WA_SetPalette)
+    if theme is None:
+        if not has_palette:
+            return PropagationTiming(name, time.perf_counter() - start, True)
+        palette = QtGui.QPalette()
+    else:
+        palette = get_palette(theme)
+        if has_palette and widget.palette() == palette:
+            return PropagationTiming(name, time.perf_counter() - start, True)
+
+    widget.setPalette(palette)
+    timing = PropagationTiming(name, time.perf_counter() - start, False)
+    logger.debug(f'Set theme for {name!r} in {timing.seconds * 1000:.3f} ms.')
+    return timing
+
+
+class ThemeScope:
+    """
+    A group of widget subtrees that share a theme.
+
+    The theme is applied to each widget added to the scope with `set_widget_theme()`,
+    so changing the theme of the scope only affects the widgets in the scope. The time
+    of each propagation is recorded in `timings`.
+    """
+
+    def __init__(self, theme: Theme | str | None = None) -> None:
+        self._theme = get_theme(theme) if isinstance(theme, str) else theme
+        self._widgets: dict[int, QtWidgets.QWidget] = {}
+        self.timings: collections.deque[PropagationTiming] = collections.deque(
+            maxlen=TIMINGS_SIZE
+        )
+
+    def theme(self) -> Theme | None:
+        return self._theme
+
+    def widgets(self) -> list[QtWidgets.QWidget]:
+        return list(self._widgets.values())
+
+    def add_widget(self, widget: QtWidgets.QWidget) -> None:
+        """Add the widget subtree to the scope and apply the theme of the scope."""
+
+        key = id(widget)
+        if key in self._widgets:
+            return
+        self._widgets[key] = widget
+        widget.destroyed.connect(lambda: self._widgets.pop(key, None))
+        if self._theme is not None:
+            self.timings.append(set_widget_theme(widget, self._theme))
+
+    def remove_widget(self, widget: QtWidgets.QWidget) -> None:
+        """Remove the widget subtree from the scope and reset its palette."""
+
+        if self._widgets.pop(id(widget), None) is not None:
+            self.timings.append(set_widget_theme(widget, None))
+
+    def set_theme(self, theme: Theme | str | None) -> float:
+        """
+        Apply the theme to all widget subtrees in the scope.
+
+        Return the total seconds spent propagating the palette.
+        """
+
+        if isinstance(theme, str):
+            if not (theme := get_theme(theme)):
+                return 0
+        self._theme = theme
+
+        seconds = 0
+        for widget in self.widgets():
+            timing = set_widget_theme(widget, theme)
+            self.timings.append(timing)
+            seconds += timing.seconds
+        return seconds
@@ -0,0 +1,258 @@
+"""
+Snapshots of the applied palette, to theme the application before any theme is read.
+
+A snapshot stores the resolved palette as raw ARGB values together with the name of the
+theme and the mtime and size of its source files. Restoring a snapshot reads a single
+file and sets the palette, the theme itself is only checked afterwards.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+import os
+import struct
+
+from ._qt import QtCore, QtGui, QtWidgets
+from ._theme import (
+    GROUP_NAMES,
+    NAME_PROPERTY_NAME,
+    PROPERTY_NAME,
+    ROLE_NAMES,
+    SNAPSHOT,
+    _find_theme_path,
+    _theme_dependencies,
+    get_theme,
+    set_theme,
+)
+
+MAGIC = b'QTPS'
+VERSION = 1
+
+# magic, version, group count, role count, source count, name length
+HEADER = struct.Struct('<4sHHHHH')
+# mtime_ns, size, path length
+SOURCE_RECORD = struct.Struct('<qqH')
+
+logger = logging.getLogger(__package__)
+
+
+@dataclasses.dataclass
+class PaletteSnapshot:
+    name: str
+    # The path, mtime_ns and size of the theme file and the files it extends.
+    sources: tuple[tuple[str, int, int], ...]
+    # The ARGB value of each role by group, None for roles the binding doesn't have.
+    colors: dict[str, tuple[int | None, ...]]
+
+    def palette(self) -> QtGui.QPalette:
+        """Return the palette of the snapshot."""
+
+        ColorGroup = QtGui.QPalette.ColorGroup
+        ColorRole = QtGui.QPalette.ColorRole
+        palette = QtGui.QPalette()
+        for group_name, values in self.colors.items():
+            group = getattr(ColorGroup, group_name)
+            for role_name, value in zip(ROLE_NAMES, values):
+                role = getattr(ColorRole, role_name, None)
+                if value is not None and role is not None:
+                    palette.setColor(group, role, QtGui.QColor.fromRgba(value))
+        return palette
+
+    def is_current(self) -> bool:
+        """Return whether the source files of the theme didn't change."""
+
+        # A theme file with the same name in an earlier search path shadows the source.
+        theme_path = self.sources[0][0] if self.sources else None
+        if _find_theme_path(self.name) != theme_path:
+            return False
+        for path, mtime, size in self.sources:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return False
+            if stat.st_mtime_ns != mtime or stat.st_size != size:
+                return False
+        return True
+
+
+def save_snapshot(path: str | None = None, name: str | None = None) -> None:
+    """
+    Save the palette of the QApplication as a snapshot of the theme with `name`.
+
+    By default, the snapshot is saved to the path of the environment variable
+    `QT_THEMES_SNAPSHOT` for the theme that was set with `set_theme()`.
+
+    :raises ValueError: if no path is provided or no theme was set by name.
+    """
+
+    if path is None and not (path := os.getenv(SNAPSHOT)):
+        raise ValueError(f'No snapshot path provided and {SNAPSHOT} is not set.')
+    if name is None:
+        if application := QtWidgets.QApplication.instance():
+            name = application.property(NAME_PROPERTY_NAME)
+        if not name:
+            raise ValueError('Cannot save a snapshot without a theme name.')
+
+    sources = []
+    if theme_path := _find_theme_path(name):
+        for source in (theme_path, *_theme_dependencies(theme_path)):
+            try:
+                stat = os.stat(source)
+            except OSError:
+                continue
+            sources.append((source.encode(), stat.st_mtime_ns, stat.st_size))
+
+    ColorGroup = QtGui.QPalette.ColorGroup
+    ColorRole = QtGui.QPalette.ColorRole
+    palette = QtWidgets.QApplication.palette()
+    roles = [getattr(ColorRole, role_name, None) for role_name in ROLE_NAMES]
+    masks = []
+    values = []
+    for group_name in GROUP_NAMES:
+        group = getattr(ColorGroup, group_name)
+        mask = 0
+        for i, role in enumerate(roles):
+            if role is None:
+                values.append(0)
+                continue
+            mask |= 1 << i
+            values.append(palette.color(group, role).rgba())
+        masks.append(mask)
+
+    encoded_name = name.encode()
+    data = bytearray()
+    data += HEADER.pack(
+        MAGIC,
+        VERSION,
+        len(GROUP_NAMES),
+        len(ROLE_NAMES),
+        len(sources),
+        len(encoded_name),
+    )
+    data += encoded_name
+    for source, mtime, size in sources:
+        data += SOURCE_RECORD.pack(mtime, size, len(source))
+        data += source
+    data += struct.pack(f'<{len(masks)}I', *masks)
+    data += struct.pack(f'<{len(values)}I', *values)
+
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+    logger.debug(f'Saved palette snapshot of {name!r} to {path!r}.')
+
+
+def remove_snapshot(path: str | None = None) -> bool:
+    """
+    Remove the snapshot at `path` or at `QT_THEMES_SNAPSHOT`.
+
+    Return whether a snapshot was removed.
+    """
+
+    if path is None and not (path := os.getenv(SNAPSHOT)):
+        return False
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+    logger.debug(f'Removed palette snapshot {path!r}.')
+    return True
+
+
+def load_snapshot(path: str | None = None) -> PaletteSnapshot | None:
+    """
+    Return the snapshot at `path` or at `QT_THEMES_SNAPSHOT` if it is valid.
+
+    The snapshot is read with a single read, no theme files are accessed.
+    """
+
+    if path is None and not (path := os.getenv(SNAPSHOT)):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    try:
+        magic, version, group_count, role_count, source_count, name_length = (
+            HEADER.unpack_from(data)
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError
+        if group_count != len(GROUP_NAMES) or role_count != len(ROLE_NAMES):
+            raise ValueError
+        offset = HEADER.size
+        name = data[offset : offset + name_length].decode()
+        offset += name_length
+
+        sources = []
+        for _ in range(source_count):
+            mtime, size, length = SOURCE_RECORD.unpack_from(data, offset)
+            offset += SOURCE_RECORD.size
+            sources.append((data[offset : offset + length].decode(), mtime, size))
+            offset += length
+
+        masks = struct.unpack_from(f'<{group_count}I', data, offset)
+        offset += group_count * 4
+        values = struct.unpack_from(f'<{group_count * role_count}I', data, offset)
+    except (struct.error, UnicodeDecodeError, ValueError):
+        logger.warning(f'Invalid palette snapshot {path!r}.')
+        return None
+
+    colors = {}
+    for i, (group_name, mask) in enumerate(zip(GROUP_NAMES, masks)):
+        group_values = values[i * role_count : (i + 1) * role_count]
+        colors[group_name] = tuple(
+            value if mask & (1 << j) else None for j, value in enumerate(group_values)
+        )
+    return PaletteSnapshot(name, tuple(sources), colors)
+
+
+def restore_snapshot(
+    path: str | None = None, style: str | None = 'fusion', verify: bool = True
+) -> PaletteSnapshot | None:
+    """
+    Set the palette of the snapshot at `path` or at `QT_THEMES_SNAPSHOT`.
+
+    Call this after creating the QApplication and before showing any window. If
+    `verify` is True, the theme is checked with `verify_snapshot()` once the event loop
+    runs. Return the snapshot or None if there is no valid snapshot.
+    """
+
+    if not (snapshot := load_snapshot(path)):
+        return None
+
+    if style:
+        QtWidgets.QApplication.setStyle(style)
+    QtWidgets.QApplication.setPalette(snapshot.palette())
+    if application := QtWidgets.QApplication.instance():
+        application.setProperty(NAME_PROPERTY_NAME, snapshot.name)
+    if verify:
+        QtCore.QTimer.singleShot(0, lambda: verify_snapshot(snapshot))
+    return snapshot
+
+
+def verify_snapshot(snapshot: PaletteSnapshot) -> bool:
+    """
+    Check the theme of a restored snapshot and set it again if its files changed.
+
+    Return whether the theme was set again.
+    """
+
+    application = QtWidgets.QApplication.instance()
+    if application is None or application.property(NAME_PROPERTY_NAME) != snapshot.name:
+        # A different theme was set since the snapshot was restored.
+        return False
+
+    if not snapshot.is_current():
+        logger.debug(f'Palette snapshot of {snapshot.name!r} is outdated.')
+        set_theme(snapshot.name, style=None)
+        return True
+
+    # The palette is current, only the theme of the application is missing.
+    if theme := get_theme(snapshot.name):
+        application.setProperty(PROPERTY_NAME, theme)
+    return False
@@ -0,0 +1,142 @@
+"""
+Render stylesheets from templates with the colors of a theme.
+
+Templates are QSS with `@field` placeholders for the colors of a theme, for example
+`background-color: @surface0;`. Use `@@` for a literal `@`.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import re
+
+from ._cache import CacheInfo, LRUCache
+from ._color import Color
+from ._qt import QtWidgets
+from ._theme import FIELDS, Theme, get_theme
+
+STYLESHEET_CACHE_SIZE = 128
+
+logger = logging.getLogger(__package__)
+
+_PLACEHOLDER = re.compile(r'@(@|[A-Za-z_][A-Za-z0-9_]*)')
+
+
+class StyleSheet:
+    """
+    A compiled stylesheet template.
+
+    The template is split into literal text and theme fields once, rendering only joins
+    the parts with the color names.
+    """
+
+    def __init__(self, source: str) -> None:
+        """:raises ValueError: if the template has a placeholder that isn't a field."""
+
+        self.source = source
+
+        parts: list[str] = []
+        fields: list[str] = []
+        literal = []
+        end = 0
+        for match in _PLACEHOLDER.finditer(source):
+            literal.append(source[end : match.start()])
+            end = match.end()
+            name = match.group(1)
+            if name == '@':
+                literal.append('@')
+                continue
+            if name not in FIELDS:
+                raise ValueError(f'Unexpected theme color {name!r} in stylesheet.')
+            parts.append(''.join(literal))
+            fields.append(name)
+            literal = []
+        literal.append(source[end:])
+        parts.append(''.join(literal))
+
+        # Literal parts around the fields, there is always one more part than fields.
+        self.parts = tuple(parts)
+        self.fields = tuple(fields)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(fields={self.fields!r})'
+
+    def render(self, theme: Theme) -> str:
+        """
+        Return the stylesheet with the colors of `theme`.
+
+        Stylesheets are cached by the colors of the fields used in the template, so
+        rendering for a theme that was used before doesn't format it again.
+
+        :raises ValueError: if the theme doesn't have a color used in the template.
+        """
+
+        colors = tuple(getattr(theme, name) for name in self.fields)
+        key = (self.source, tuple(c if c is None else c.rgba() for c in colors))
+        return _stylesheet_cache.get(key, lambda: self._render(colors))
+
+    def _render(self, colors: tuple) -> str:
+        text = [self.parts[0]]
+        for name, color, part in zip(self.fields, colors, self.parts[1:]):
+            if color is None:
+                raise ValueError(f'Theme has no color {name!r}.')
+            text.append(_color_name(Color.from_qcolor(color)))
+            text.append(part)
+        return ''.join(text)
+
+
+@functools.lru_cache(maxsize=STYLESHEET_CACHE_SIZE)
+def compile_stylesheet(source: str) -> StyleSheet:
+    """
+    Return the compiled stylesheet for the template `source`.
+
+    Templates are only compiled once.
+
+    :raises ValueError: if the template has a placeholder that isn't a field.
+    """
+
+    return StyleSheet(source)
+
+
+def apply_stylesheet(
+    template: StyleSheet | str,
+    widget: QtWidgets.QWidget | None = None,
+    theme: Theme | str | None = None,
+) -> bool:
+    """
+    Set the stylesheet rendered from `template` for `widget` or the QApplication.
+
+    If no theme is provided, the current theme of the QApplication is used. The
+    stylesheet isn't set again if it didn't change, which avoids polishing every widget.
+    Return whether the stylesheet was set.
+    """
+
+    if isinstance(template, str):
+        template = compile_stylesheet(template)
+    if theme is None or isinstance(theme, str):
+        if not (theme := get_theme(theme)):
+            return False
+
+    target = widget or QtWidgets.QApplication.instance()
+    stylesheet = template.render(theme)
+    if target.styleSheet() == stylesheet:
+        logger.debug('Stylesheet is unchanged.')
+        return False
+    target.setStyleSheet(stylesheet)
+    return True
+
+
+def stylesheet_cache_info() -> CacheInfo:
+    """Return the hit and miss counters of the rendered stylesheet cache."""
+
+    return _stylesheet_cache.info()
+
+
+def _color_name(color: Color) -> str:
+    if color.alpha == 255:
+        return color.name()
+    return f'rgba({color.red}, {color.green}, {color.blue}, {color.alpha})'
+
+
+_stylesheet_cache: LRUCache[str] = LRUCache(STYLESHEET_CACHE_SIZE)
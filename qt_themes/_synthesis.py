@@ -0,0 +1,368 @@
+"""
+Generate themes from a base and an accent seed color.
+
+The neutral ramp from `crust` to `text` is derived from the base color and the accent
+colors from the accent color in OKLab. The lightness of the colors is then adjusted
+until the colors that `update_palette()` pairs with each other meet the minimum
+contrast ratios of `CONTRAST_PAIRS`.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from typing import Union
+
+from . import _colormath
+from ._audit import CONTRAST_PAIRS
+from ._color import Color
+from ._colormath import Colors, np
+from ._theme import FIELDS, Theme
+
+Seed = Union[Color, str, Sequence[int]]
+
+# Lightness of the ramp colors relative to the base color, towards the text.
+RAMP = (
+    ('surface0', 0.07),
+    ('surface1', 0.12),
+    ('surface2', 0.17),
+    ('overlay0', 0.24),
+    ('overlay1', 0.3),
+    ('overlay2', 0.36),
+)
+# Lightness of the colors behind the base color, always darker.
+BACKGROUNDS = (('mantle', 0.025), ('crust', 0.05))
+# OKLab hue angles in degrees.
+HUES = (
+    ('magenta', 330),
+    ('red', 20),
+    ('orange', 55),
+    ('yellow', 95),
+    ('green', 145),
+    ('cyan', 195),
+    ('blue', 255),
+)
+# Added to the minimum contrast ratios, so rounding to 8-bit can't fail a check.
+CONTRAST_MARGIN = 0.05
+# Contrast of the background closest to the text against white in dark themes and
+# black in light themes. Light themes need light backgrounds, as the HighlightedText
+# color is the background for bright primary colors.
+BACKGROUND_CONTRAST = (8.0, 14.0)
+BACKGROUND_CHROMA = 0.06
+BISECTION_STEPS = 16
+# Hue rotations in degrees to try if the primary color can't meet its contrast.
+HIGHLIGHT_ROTATIONS = (20, -20, 40, -40, 60, -60, 90, -90, 120, -120, 180)
+
+
+def synthesize_theme(base: Seed, accent: Seed | None = None) -> Theme:
+    """
+    Return a theme generated from a base and an accent color.
+
+    Without an accent color, the complementary hue of the base color is used.
+    """
+
+    colors = synthesize_themes([base], None if accent is None else [accent])
+    rows = colors.tolist() if np is not None else colors
+    return Theme.from_colors(
+        {name: Color(*color) for name, color in zip(FIELDS, rows[0])}
+    )
+
+
+def synthesize_themes(
+    bases: Sequence[Seed] | Colors, accents: Sequence[Seed] | Colors | None = None
+) -> Colors:
+    """
+    Return the 8-bit RGBA colors of themes generated from arrays of seed colors.
+
+    The result has the same layout as `theme_array()`, with the shape (themes, fields,
+    4). With NumPy, all themes are generated in one vectorized pass.
+
+    :param bases: The base colors as colors, hex strings or 8-bit RGB(A) values.
+    :param accents: The accent colors, one for each base color.
+    """
+
+    base_rgb = _seeds(bases)
+    accent_rgb = None if accents is None else _seeds(accents)
+    if accent_rgb is not None and len(accent_rgb) != len(base_rgb):
+        raise ValueError('bases and accents must have the same length')
+
+    if np is None:
+        rows = []
+        for i, rgb in enumerate(base_rgb):
+            accent = None
+            if accent_rgb is not None:
+                accent = _colormath.rgb_to_oklab(accent_rgb[i])
+            lab = _synthesize(_Scalar, _colormath.rgb_to_oklab(rgb), accent)
+            rows.append([_to_rgba(_Scalar, lab[name]) for name in FIELDS])
+        return rows
+
+    base_lab = tuple(_colormath.rgb_to_oklab(base_rgb).T)
+    accent_lab = None
+    if accent_rgb is not None:
+        accent_lab = tuple(_colormath.rgb_to_oklab(accent_rgb).T)
+    lab = _synthesize(np, base_lab, accent_lab)
+    return np.stack([_to_rgba(np, lab[name]) for name in FIELDS], axis=-2)
+
+
+def score_themes(colors: Colors) -> Colors:
+    """
+    Return the lowest ratio of contrast to minimum contrast of `CONTRAST_PAIRS` in the
+    Active group for each theme of a `theme_array()`. Themes with a score of at least 1
+    pass all checks.
+    """
+
+    roles = _active_roles(colors)
+    scores = []
+    for pair in CONTRAST_PAIRS:
+        background = roles[pair.background]
+        foreground = _colormath.composite(roles[pair.foreground], background)
+        ratio = _colormath.contrast_ratio(foreground, _colormath.to_float(background))
+        scores.append((ratio, pair.minimum))
+
+    if np is None:
+        columns = ([ratio / minimum for ratio in ratios] for ratios, minimum in scores)
+        return [min(values) for values in zip(*columns)]
+    return np.min(np.stack([ratio / minimum for ratio, minimum in scores]), axis=0)
+
+
+def _synthesize(xp, base: tuple, accent: tuple | None) -> dict[str, tuple]:
+    """Returns the OKLab lightness, a and b of each field."""
+
+    lightness, chroma, hue = _lch(xp, base)
+    dark = lightness < 0.5
+    direction = xp.where(dark, 1.0, -1.0)
+    target = xp.where(dark, 1.0, 0.0)
+    chroma = xp.minimum(chroma, BACKGROUND_CHROMA)
+    neutral_chroma = xp.minimum(chroma, 0.05)
+
+    # Move the base color away from the text until the background closest to the text
+    # leaves enough room for the text and the highlight.
+    extreme = (target, 0.0, 0.0)
+    closest_l = xp.where(dark, lightness, lightness - BACKGROUNDS[-1][1])
+    closest = _lab(xp, closest_l, chroma, hue)
+    minimum = xp.where(dark, *BACKGROUND_CONTRAST)
+    fitted = _fit(xp, closest, extreme, minimum, 1 - target)
+    lightness = lightness + fitted[0] - closest_l
+
+    lab = {'base': _lab(xp, lightness, chroma, hue)}
+    for name, step in BACKGROUNDS:
+        lab[name] = _lab(xp, lightness - step, chroma, hue)
+    for name, step in RAMP:
+        lab[name] = _lab(xp, lightness + direction * step, neutral_chroma, hue)
+    text_lightness = xp.where(dark, 0.93, 0.3)
+    lab['text'] = _lab(xp, text_lightness, neutral_chroma * 0.4, hue)
+
+    # The colors of the Base and AlternateBase roles depend on the theme being dark.
+    base_role = _select(xp, dark, lab['mantle'], lab['crust'])
+    alternate_role = _select(xp, dark, lab['base'], lab['mantle'])
+    for background in (base_role, alternate_role, lab['base']):
+        lab['text'] = _fit(xp, lab['text'], background, 4.5, target)
+    lab['overlay2'] = _fit(xp, lab['overlay2'], lab['mantle'], 4.5, target)
+    lab['overlay1'] = _fit(xp, lab['overlay1'], base_role, 3, target)
+
+    # Subtexts between the text and the overlays.
+    text_l = lab['text'][0]
+    overlay_l = lab['overlay2'][0]
+    for name, t in (('subtext1', 1 / 3), ('subtext0', 2 / 3)):
+        subtext_l = text_l + (overlay_l - text_l) * t
+        lab[name] = _lab(xp, subtext_l, neutral_chroma * 0.6, hue)
+
+    # Accents with the lightness and chroma of the accent color.
+    if accent is None:
+        accent_l = xp.where(dark, 0.75, 0.55)
+        accent_c = 0.12
+        accent_h = hue + math.pi
+    else:
+        accent_l, accent_c, accent_h = _lch(xp, accent)
+        accent_c = xp.maximum(accent_c, 0.08)
+    for name, degrees in HUES:
+        color = _lab(xp, accent_l, accent_c, math.radians(degrees))
+        lab[name] = _fit(xp, color, lab['base'], 3, target)
+
+    lab['secondary'] = _fit(
+        xp, _lab(xp, accent_l, accent_c, accent_h - math.pi / 3), base_role, 4.5, target
+    )
+    lab['primary'] = _fit_highlight(
+        xp, _lab(xp, accent_l, accent_c, accent_h), lab['mantle'], lab['text']
+    )
+    return lab
+
+
+def _fit_highlight(xp, primary: tuple, mantle: tuple, text: tuple) -> tuple:
+    """
+    Returns the primary color with enough contrast to the HighlightedText color.
+
+    `update_palette()` picks the HighlightedText color by the value of the primary
+    color, so the primary color is fitted against both candidates. The first fit that
+    meets the contrast to the color that is then picked is used.
+    """
+
+    chroma, hue = _lch(xp, primary)[1:]
+    candidates = [(primary, mantle), (primary, text)]
+    # Starting from the lightness of the text keeps the primary color as bright as
+    # possible, e.g. for dark accent colors in light themes.
+    for highlighted_text in (mantle, text):
+        start = _lab(xp, highlighted_text[0], chroma, hue)
+        candidates.append((start, highlighted_text))
+    # Some hues can't be dark and bright at the same time, e.g. yellow in light themes.
+    # As a last resort the hue is rotated until the contrast is met.
+    for degrees in HIGHLIGHT_ROTATIONS:
+        rotated_hue = hue + math.radians(degrees)
+        for highlighted_text in (mantle, text):
+            rotated_chroma = xp.maximum(chroma, 0.2)
+            start = _lab(xp, highlighted_text[0], rotated_chroma, rotated_hue)
+            candidates.append((start, highlighted_text))
+
+    best = best_ratio = None
+    for color, highlighted_text in candidates:
+        # Towards black for light text colors and towards white for dark ones.
+        target = xp.where(highlighted_text[0] > 0.5, 0.0, 1.0)
+        fitted = _fit(xp, color, highlighted_text, 4.5, target)
+        picked = _select(xp, _qt_value(xp, _to_rgba(xp, fitted)), mantle, text)
+        ratio = _contrast(xp, fitted, picked)
+        if best is None:
+            best, best_ratio = fitted, ratio
+            continue
+        better = (best_ratio < 4.5) & (ratio > best_ratio)
+        best = _select(xp, better, fitted, best)
+        best_ratio = xp.where(better, ratio, best_ratio)
+    return best
+
+
+def _fit(xp, color: tuple, background: tuple, minimum: float, target) -> tuple:
+    """
+    Returns the color with the lightness moved towards `target` until its contrast
+    ratio to `background` is at least `minimum`.
+    """
+
+    minimum = minimum + CONTRAST_MARGIN
+    lightness, a, b = color
+    background_luminance = _luminance(xp, background)
+
+    def passes(t):
+        shifted = (lightness + (target - lightness) * t, a, b)
+        luminance = _luminance(xp, shifted)
+        return _ratio(xp, luminance, background_luminance) >= minimum
+
+    # Bisect the smallest shift that passes, the contrast grows with the shift.
+    low = 0.0 * lightness
+    high = 1.0 + low
+    for _ in range(BISECTION_STEPS):
+        middle = (low + high) / 2
+        passed = passes(middle)
+        high = xp.where(passed, middle, high)
+        low = xp.where(passed, low, middle)
+    t = xp.where(passes(0.0 * lightness), 0.0, high)
+    return (lightness + (target - lightness) * t, a, b)
+
+
+def _contrast(xp, a: tuple, b: tuple):
+    return _ratio(xp, _luminance(xp, a), _luminance(xp, b))
+
+
+def _ratio(xp, luminance_a, luminance_b):
+    lighter = xp.maximum(luminance_a, luminance_b)
+    darker = xp.minimum(luminance_a, luminance_b)
+    return (lighter + 0.05) / (darker + 0.05)
+
+
+def _lch(xp, lab: tuple) -> tuple:
+    lightness, a, b = lab
+    return lightness, xp.hypot(a, b), xp.arctan2(b, a)
+
+
+def _lab(xp, lightness, chroma, hue) -> tuple:
+    lightness = xp.minimum(xp.maximum(lightness, 0.0), 1.0)
+    return lightness, chroma * xp.cos(hue), chroma * xp.sin(hue)
+
+
+def _select(xp, condition, a: tuple, b: tuple) -> tuple:
+    return tuple(xp.where(condition, x, y) for x, y in zip(a, b))
+
+
+def _luminance(xp, lab: tuple):
+    return _colormath.relative_luminance(_rgb(xp, lab))
+
+
+def _rgb(xp, lab: tuple) -> Colors:
+    if xp is np:
+        return _colormath.oklab_to_rgb(np.stack(np.broadcast_arrays(*lab), axis=-1))
+    return _colormath.oklab_to_rgb(lab)
+
+
+def _to_rgba(xp, lab: tuple) -> Colors:
+    """Returns the 8-bit RGBA color of OKLab lightness, a and b."""
+
+    rgb = _colormath.to_uint8(_rgb(xp, lab))
+    if xp is np:
+        alpha = np.full(rgb.shape[:-1] + (1,), 255, dtype=np.uint8)
+        return np.concatenate((rgb, alpha), axis=-1)
+    return (*rgb, 255)
+
+
+def _qt_value(xp, rgba: Colors):
+    if xp is np:
+        return _colormath._qt_value_array(rgba) > np.float32(0.5)
+    return _colormath._qt_value(rgba) > 0.5
+
+
+def _active_roles(colors: Colors) -> dict[str, Colors]:
+    """Returns the colors of the Active group roles that `update_palette()` sets."""
+
+    derived = _colormath.derive_palette_colors(colors)
+    dark = derived['is_dark']
+    fields = {name: _colormath.field(colors, name) for name in FIELDS}
+    if np is None:
+        base = [
+            m if d else c for d, m, c in zip(dark, fields['mantle'], fields['crust'])
+        ]
+        alternate = [
+            b if d else m for d, b, m in zip(dark, fields['base'], fields['mantle'])
+        ]
+    else:
+        base = np.where(dark[..., np.newaxis], fields['mantle'], fields['crust'])
+        alternate = np.where(dark[..., np.newaxis], fields['base'], fields['mantle'])
+    return {
+        'WindowText': fields['text'],
+        'Window': fields['base'],
+        'Text': fields['text'],
+        'Base': base,
+        'AlternateBase': alternate,
+        'ButtonText': fields['text'],
+        'Button': fields['base'],
+        'HighlightedText': derived['highlighted_text'],
+        'Highlight': fields['primary'],
+        'ToolTipText': fields['overlay2'],
+        'ToolTipBase': fields['mantle'],
+        'PlaceholderText': fields['overlay1'],
+        'Link': fields['secondary'],
+        'LinkVisited': fields['secondary'],
+    }
+
+
+def _seeds(seeds: Sequence[Seed] | Colors) -> Colors:
+    """Returns the float RGB colors of seed colors."""
+
+    if np is not None and isinstance(seeds, np.ndarray):
+        return _colormath.to_float(seeds.reshape(-1, seeds.shape[-1]))
+    colors = []
+    for seed in seeds:
+        if isinstance(seed, str):
+            seed = Color.from_string(seed)
+        colors.append(tuple(seed[:3]) + (255,))
+    return _colormath.to_float(colors)
+
+
+class _Scalar:
+    """The functions of NumPy that `_synthesize()` uses, for single floats."""
+
+    cos = staticmethod(math.cos)
+    sin = staticmethod(math.sin)
+    hypot = staticmethod(math.hypot)
+    arctan2 = staticmethod(math.atan2)
+    minimum = staticmethod(min)
+    maximum = staticmethod(max)
+
+    @staticmethod
+    def where(condition: bool, a: float, b: float) -> float:
+        return a if condition else b
@@ -1,24 +1,57 @@
 from __future__ import annotations
 
 import dataclasses
+import functools
 import importlib.resources
 import json
 import logging
 import os
+from collections.abc import Iterator
+from concurrent.futures import Future
 from json import JSONDecodeError
-
-try:
-    from PySide6 import QtGui, QtWidgets
-except ImportError:
-    from PySide2 import QtGui, QtWidgets
+from typing import TYPE_CHECKING, NamedTuple
 
 import qt_themes
+from . import _profiling, _qt
+from ._cache import CacheInfo, LRUCache
+from ._color import Color
+from ._qt import QtGui, QtWidgets
+from ._registry import ThemeRegistry
 
-ColorGroup = QtGui.QPalette.ColorGroup
-ColorRole = QtGui.QPalette.ColorRole
+if TYPE_CHECKING:
+    from ._bundle import ThemeBundle
 
 THEMES = 'QT_THEMES'
+SNAPSHOT = 'QT_THEMES_SNAPSHOT'
 PROPERTY_NAME = 'theme'
+NAME_PROPERTY_NAME = 'theme_name'
+EXTENDS = 'extends'
+PALETTE_CACHE_SIZE = 32
+
+GROUP_NAMES = ('Active', 'Inactive', 'Disabled')
+ROLE_NAMES = (
+    'WindowText',
+    'Button',
+    'Light',
+    'Midlight',
+    'Dark',
+    'Mid',
+    'Text',
+    'BrightText',
+    'ButtonText',
+    'Base',
+    'Window',
+    'Shadow',
+    'Highlight',
+    'HighlightedText',
+    'Link',
+    'LinkVisited',
+    'AlternateBase',
+    'ToolTipBase',
+    'ToolTipText',
+    'PlaceholderText',
+    'Accent',
+)
 
 logger = logging.getLogger(__package__)
 
@@ -52,6 +85,33 @@ class Theme:
     def is_dark_theme(self) -> bool:
         return self.text.value() > self.base.value()
 
+    def copy(self) -> Theme:
+        """Return a copy of the theme that doesn't share any colors."""
+
+        colors = {}
+        for field in dataclasses.fields(self):
+            color = getattr(self, field.name)
+            colors[field.name] = None if color is None else QtGui.QColor(color)
+        return Theme(**colors)
+
+    def colors(self) -> dict[str, Color]:
+        """Return the colors of the theme that are set as Qt-independent colors."""
+
+        colors = {}
+        for field in dataclasses.fields(self):
+            if (color := getattr(self, field.name)) is not None:
+                colors[field.name] = Color.from_qcolor(color)
+        return colors
+
+    @classmethod
+    def from_colors(cls, colors: dict[str, Color]) -> Theme:
+        """Return the theme for Qt-independent colors."""
+
+        return cls(**{key: QtGui.QColor(*color) for key, color in colors.items()})
+
+
+FIELDS = tuple(field.name for field in dataclasses.fields(Theme))
+
 
 def get_theme(name: str | None = None) -> Theme | None:
     """
@@ -62,46 +122,83 @@ def get_theme(name: str | None = None) -> Theme | None:
     """
 
     if name is None:
-        if application := QtWidgets.QApplication.instance():
+        # Without a loaded Qt binding there can't be an application.
+        if not _qt.is_loaded():
+            return
+        if application := _qt.QtCore.QCoreApplication.instance():
             return application.property(PROPERTY_NAME)
         else:
             return
 
+    if colors := get_colors(name):
+        return Theme.from_colors(colors)
+
+
+def get_colors(name: str) -> dict[str, Color] | None:
+    """
+    Return the colors of the theme with `name` if found and valid.
+
+    Unlike `get_theme()`, this doesn't require Qt.
+    """
+
+    if bundle := _get_bundle():
+        try:
+            return bundle.get_colors(name)
+        except TypeError as e:
+            logger.warning(str(e))
+            return
+        except KeyError:
+            pass
+
     file_name = f'{name}.json'
-    themes_paths = _get_paths()
-    for themes_path in themes_paths:
-        path = os.path.join(themes_path, file_name)
-        if os.path.exists(path):
-            break
-    else:
+    if not (path := _find_theme_path(name)):
         logger.warning(f'Cannot find theme {file_name!r}.')
         return
 
     try:
-        return _load(path)
+        return _registry.load(path)
     except (JSONDecodeError, TypeError):
         logger.warning(f'Invalid theme {path!r}.')
         return
+    except FileNotFoundError:
+        logger.warning(f'Cannot find theme {file_name!r}.')
+        return
 
 
 def get_themes() -> dict[str, Theme]:
     """Return all valid themes found on disk as a dictionary."""
 
-    themes_paths = _get_paths()
+    return {
+        name: Theme.from_colors(colors) for name, colors in _get_all_colors().items()
+    }
+
+
+def _get_all_colors() -> dict[str, dict[str, Color]]:
+    """Return the colors of all valid themes found on disk by name."""
+
+    if bundle := _get_bundle():
+        try:
+            return bundle.get_all_colors()
+        except KeyError:
+            pass
+
+    with _profiling.span('discover'):
+        paths = [
+            theme_file
+            for themes_path in _get_paths()
+            for theme_file in _list_theme_files(themes_path)
+        ]
+
+    # Unlike `_find_theme_paths()`, an invalid theme doesn't shadow a valid one.
     themes = {}
-    for themes_path in themes_paths:
-        if not os.path.exists(themes_path):
+    for name, path in paths:
+        try:
+            themes[name] = _registry.load(path)
+        except (JSONDecodeError, TypeError):
+            logger.warning(f'Invalid theme {path!r}.')
+            continue
+        except FileNotFoundError:
             continue
-        for file_name in os.listdir(themes_path):
-            name, ext = os.path.splitext(file_name)
-            if ext != '.json':
-                continue
-            path = os.path.join(themes_path, file_name)
-            try:
-                themes[name] = _load(path)
-            except (JSONDecodeError, TypeError):
-                logger.warning(f'Invalid theme {path!r}.')
-                continue
 
     return themes
 
@@ -109,6 +206,14 @@ def get_themes() -> dict[str, Theme]:
 def update_palette(palette: QtGui.QPalette, theme: Theme) -> None:
     """Set the Theme for the given QPalette."""
 
+    with _profiling.span('build_palette'):
+        _update_palette(palette, theme)
+
+
+def _update_palette(palette: QtGui.QPalette, theme: Theme) -> None:
+    ColorGroup = QtGui.QPalette.ColorGroup
+    ColorRole = QtGui.QPalette.ColorRole
+
     # Colors
     highlighted_color = theme.primary
     if highlighted_color.valueF() > 0.5:
@@ -176,32 +281,158 @@ def update_palette(palette: QtGui.QPalette, theme: Theme) -> None:
         pass
 
 
-def set_theme(theme: Theme | str | None, style: str | None = 'fusion') -> None:
+def get_palette(theme: Theme) -> QtGui.QPalette:
+    """
+    Return a QPalette for the Theme.
+
+    Palettes are cached by the theme's colors, so requesting a palette for a theme that
+    was used before doesn't build it again.
+    """
+
+    missed = False
+
+    def factory() -> QtGui.QPalette:
+        nonlocal missed
+        missed = True
+        palette = QtGui.QPalette()
+        update_palette(palette, theme)
+        return palette
+
+    palette = _palette_cache.get(_theme_key(theme), factory)
+    _profiling.count('palette_cache_misses' if missed else 'palette_cache_hits')
+    # QPalette is implicitly shared, the copy protects the cached palette.
+    return QtGui.QPalette(palette)
+
+
+def diff_palettes(
+    old: QtGui.QPalette, new: QtGui.QPalette
+) -> list[tuple[QtGui.QPalette.ColorGroup, QtGui.QPalette.ColorRole]]:
+    """Return the (group, role) pairs that have a different color in `new`."""
+
+    changes = []
+    for group, role in _palette_entries():
+        if old.color(group, role) != new.color(group, role):
+            changes.append((group, role))
+    return changes
+
+
+def apply_palette(palette: QtGui.QPalette) -> int:
+    """
+    Set the palette for the current QApplication if any of its colors differ.
+
+    If no color changed, the application palette isn't set at all, which avoids sending
+    a palette change event to every widget. Otherwise the whole palette is set, so
+    colors that happen to match the current palette are still set explicitly and
+    don't follow the system palette later. Return the number of changed colors.
+    """
+
+    with _profiling.span('apply_palette'):
+        changes = diff_palettes(QtWidgets.QApplication.palette(), palette)
+        if not changes:
+            logger.debug('Palette is unchanged.')
+            return 0
+        QtWidgets.QApplication.setPalette(palette)
+    logger.debug(f'Changed {len(changes)} palette colors.')
+    return len(changes)
+
+
+def palette_cache_info() -> CacheInfo:
+    """Return the hit and miss counters of the palette cache."""
+
+    return _palette_cache.info()
+
+
+def set_theme(
+    theme: Theme | str | Future[Theme | None] | None, style: str | None = 'fusion'
+) -> None:
     """
     Sets the theme and style for the current QApplication.
     By default, set the Fusion style as it works the best with QPalette ColorRoles.
+
+    If `theme` is a pending future, the theme is set on the main thread once the
+    future is done.
     """
 
     # Set style
     if style:
         QtWidgets.QApplication.setStyle(style)
 
+    # Wait for theme
+    if isinstance(theme, Future):
+        if not theme.done():
+            from ._loader import call_in_main_thread
+
+            def loaded(future: Future[Theme | None]) -> None:
+                call_in_main_thread(lambda: set_theme(future, style=None))
+
+            theme.add_done_callback(loaded)
+            return
+
+        try:
+            theme = theme.result()
+        except Exception as e:
+            logger.warning(f'Cannot load theme: {e}')
+            return
+        if not theme:
+            return
+
     # Reset theme
     if not theme:
         QtWidgets.QApplication.setPalette(QtGui.QPalette())
+        if application := QtWidgets.QApplication.instance():
+            application.setProperty(NAME_PROPERTY_NAME, None)
+        _update_snapshot(None)
         return
 
     # Set theme
+    name = None
     if isinstance(theme, str):
+        name = theme
         theme = get_theme(theme)
         if not theme:
             return
 
-    palette = QtGui.QPalette()
-    update_palette(palette, theme)
-    QtWidgets.QApplication.setPalette(palette)
+    apply_palette(get_palette(theme))
     if application := QtWidgets.QApplication.instance():
         application.setProperty(PROPERTY_NAME, theme)
+        application.setProperty(NAME_PROPERTY_NAME, name)
+
+    _update_snapshot(name)
+
+
+def invalidate_cache(path: str | None = None) -> None:
+    """
+    Discard cached themes so they are read from disk again.
+
+    If `path` is provided, only the theme file or directory at `path` is discarded.
+    """
+
+    path = None if path is None else os.fspath(path)
+    _registry.invalidate(path)
+    _files.invalidate(path)
+
+
+def _update_snapshot(name: str | None) -> None:
+    """
+    Save a snapshot of the theme with `name` for the next start if snapshots are
+    enabled.
+
+    Palettes of themes without a name can't be checked against their files at the next
+    start, so the snapshot of the previous theme is removed instead.
+    """
+
+    if not os.getenv(SNAPSHOT):
+        return
+
+    from ._snapshot import remove_snapshot, save_snapshot
+
+    try:
+        if name:
+            save_snapshot(name=name)
+        else:
+            remove_snapshot()
+    except OSError as e:
+        logger.warning(f'Cannot update palette snapshot: {e}')
 
 
 def _load(path: str) -> Theme:
@@ -213,17 +444,216 @@ def _load(path: str) -> Theme:
     :raises JSONDecodeError: if theme is invalid json.
     """
 
-    with open(str(path)) as f:
-        data = json.load(f)
-    colors = {key: QtGui.QColor(value) for key, value in data.items()}
-    return Theme(**colors)
+    return Theme.from_colors(_load_colors(path))
+
+
+class _ThemeFile(NamedTuple):
+    """The content of a single theme file before the extended themes are resolved."""
+
+    extends: str | None
+    colors: dict[str, Color]
+
+    def copy(self) -> _ThemeFile:
+        return _ThemeFile(self.extends, dict(self.colors))
+
+
+def _load_colors(path: str) -> dict[str, Color]:
+    """
+    Return the colors of the theme from `path` without requiring Qt.
+
+    A theme file can extend another theme with the `extends` key, either by the name of
+    the theme or by a file name relative to the theme file. Colors in the file override
+    the colors of the extended theme.
+
+    :raises FileNotFoundError: if theme cannot be found.
+    :raises TypeError: if theme has unexpected data, or an extended theme is invalid,
+        cannot be found or extends the theme again.
+    :raises JSONDecodeError: if theme is invalid json.
+    """
+
+    path = str(path)
+    theme_files = [_files.load(path)]
+    paths = [os.path.normpath(path)]
+    while (extends := theme_files[-1].extends) is not None:
+        if (parent := _find_extended_path(paths[-1], extends)) is None:
+            raise TypeError(f'Cannot find theme {extends!r} extended in {paths[-1]!r}.')
+        if parent in paths:
+            raise TypeError(f'Theme {path!r} extends itself through {parent!r}.')
+        try:
+            theme_files.append(_files.load(parent))
+        except (FileNotFoundError, JSONDecodeError) as e:
+            raise TypeError(f'Invalid theme {parent!r} extended in {path!r}.') from e
+        paths.append(parent)
+
+    colors = {}
+    for theme_file in reversed(theme_files):
+        colors.update(theme_file.colors)
+    return colors
+
+
+def _load_theme_file(path: str) -> _ThemeFile:
+    """
+    Return the content of the theme file at `path`.
+
+    :raises FileNotFoundError: if theme cannot be found.
+    :raises TypeError: if theme has unexpected data.
+    :raises JSONDecodeError: if theme is invalid json.
+    """
+
+    with _profiling.span('parse', path):
+        with open(path) as f:
+            data = json.load(f)
+    _profiling.count('files_parsed')
+    if not isinstance(data, dict):
+        raise TypeError(f'Unexpected theme data in {path!r}.')
+
+    extends = data.pop(EXTENDS, None)
+    if extends is not None and not isinstance(extends, str):
+        raise TypeError(f'Unexpected extended theme {extends!r} in {path!r}.')
+
+    colors = {}
+    for key, value in data.items():
+        if key not in FIELDS:
+            raise TypeError(f'Unexpected theme color {key!r} in {path!r}.')
+        try:
+            colors[key] = Color.from_string(value)
+        except ValueError as e:
+            raise TypeError(str(e)) from e
+    return _ThemeFile(extends, colors)
+
+
+def _theme_dependencies(path: str) -> tuple[str, ...]:
+    """
+    Returns the paths of the theme files that the theme at `path` extends.
+
+    If a theme is extended by name, the search paths are included as well, since adding
+    or removing theme files can change which file the name resolves to. Unlike
+    `_load_colors()`, this doesn't raise errors and stops at the first extended theme
+    that cannot be resolved.
+    """
+
+    paths = [os.path.normpath(path)]
+    by_name = False
+    try:
+        while (extends := _files.load(paths[-1]).extends) is not None:
+            by_name = by_name or not extends.endswith('.json')
+            parent = _find_extended_path(paths[-1], extends)
+            if parent is None or parent in paths:
+                break
+            paths.append(parent)
+    except (FileNotFoundError, JSONDecodeError, TypeError):
+        pass
+    if by_name:
+        paths.extend(_get_paths())
+    return tuple(paths[1:])
+
+
+def _find_extended_path(path: str, extends: str) -> str | None:
+    """Returns the path of the theme `extends` that is extended in `path`."""
+
+    if extends.endswith('.json'):
+        return os.path.normpath(os.path.join(os.path.dirname(path), extends))
+    if extended_path := _find_theme_path(extends):
+        return os.path.normpath(extended_path)
+    return None
+
+
+def _find_theme_path(name: str) -> str | None:
+    """Return the path of the theme file with `name` in the first search path."""
+
+    file_name = f'{name}.json'
+    for themes_path in _get_paths():
+        if file_name in _registry.list_dir(themes_path):
+            return os.path.join(themes_path, file_name)
+    return None
+
+
+def _find_theme_paths() -> dict[str, str]:
+    """
+    Return the paths of all theme files on disk by name.
+
+    Themes in later search paths shadow themes with the same name in earlier ones,
+    matching `get_themes()`.
+    """
+
+    theme_paths = {}
+    with _profiling.span('discover'):
+        for themes_path in _get_paths():
+            theme_paths.update(_list_theme_files(themes_path))
+    return theme_paths
+
+
+def _list_theme_files(themes_path: str) -> Iterator[tuple[str, str]]:
+    """
+    Yields the name and path of each theme file in the search path `themes_path`.
+
+    All listings of the search paths go through this, so they agree on which files are
+    themes and are counted the same way.
+    """
+
+    file_names = _registry.list_dir(themes_path)
+    _profiling.count('files_scanned', len(file_names))
+    for file_name in file_names:
+        name, ext = os.path.splitext(file_name)
+        if ext == '.json':
+            yield name, os.path.join(themes_path, file_name)
+
+
+def _theme_key(theme: Theme) -> tuple:
+    """Returns a hashable key identifying the theme by its type and colors."""
+
+    colors = (getattr(theme, field.name) for field in dataclasses.fields(theme))
+    return (type(theme),) + tuple(
+        None if color is None else color.getRgbF() for color in colors
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _palette_entries() -> (
+    tuple[tuple[QtGui.QPalette.ColorGroup, QtGui.QPalette.ColorRole], ...]
+):
+    """Returns all (group, role) pairs of a QPalette."""
+
+    ColorGroup = QtGui.QPalette.ColorGroup
+    ColorRole = QtGui.QPalette.ColorRole
+    # Newer roles don't exist in older Qt versions.
+    roles = [getattr(ColorRole, name, None) for name in ROLE_NAMES]
+    return tuple(
+        (getattr(ColorGroup, group), role)
+        for group in GROUP_NAMES
+        for role in roles
+        if role is not None
+    )
+
+
+def _get_bundle() -> ThemeBundle | None:
+    """Returns the compiled theme bundle if it is valid and up-to-date."""
+
+    from ._bundle import get_bundle
+
+    return get_bundle()
+
+
+@functools.lru_cache(maxsize=None)
+def _builtin_path() -> str:
+    """Returns the path of the themes that ship with qt_themes."""
+
+    return str(importlib.resources.files(qt_themes).joinpath('themes'))
 
 
 def _get_paths() -> tuple[str, ...]:
     """Returns all paths to search for themes."""
 
-    paths = [str(importlib.resources.files(qt_themes).joinpath('themes'))]
+    paths = [_builtin_path()]
     if env_path := os.getenv(THEMES):
         paths.extend(env_path.split(os.pathsep))
     logger.debug(f'Color themes paths: {paths}')
     return tuple(paths)
+
+
+# Parsed theme files and the flattened colors of the themes that extend them.
+_files: ThemeRegistry[_ThemeFile] = ThemeRegistry(_load_theme_file)
+_registry: ThemeRegistry[dict[str, Color]] = ThemeRegistry(
+    _load_colors, _theme_dependencies
+)
+_palette_cache: LRUCache[QtGui.QPalette] = LRUCache(PALETTE_CACHE_SIZE)
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import logging
+import math
+import time
+
+from ._qt import QtCore, QtGui
+from ._theme import FIELDS, Theme, apply_palette, get_theme, set_theme, update_palette
+
+logger = logging.getLogger(__package__)
+
+
+def interpolate_themes(start: Theme, end: Theme, t: float) -> Theme:
+    """
+    Return the theme `t` of the way from `start` to `end`, interpolated in OKLab.
+
+    Colors that are only set in one of the themes are taken from that theme.
+    """
+
+    start_colors = start.colors()
+    end_colors = end.colors()
+    colors = {}
+    for field in FIELDS:
+        start_color = start_colors.get(field)
+        end_color = end_colors.get(field)
+        if start_color is None or end_color is None:
+            color = end_color or start_color
+        else:
+            color = start_color.mix(end_color, t)
+        if color is not None:
+            colors[field] = color
+    return Theme.from_colors(colors)
+
+
+class ThemeTransition(QtCore.QObject):
+    """
+    Animate the application palette from one theme to another.
+
+    All intermediate palettes are built up front, so each frame only applies a
+    palette. Frames are applied at most `fps` times per second and are chosen by the
+    elapsed time, so if applying a palette takes longer than the frame budget, the
+    frames in between are dropped instead of slowing down the animation. At the end,
+    the target theme is set with `set_theme()`.
+    """
+
+    finished: QtCore.Signal = QtCore.Signal()
+
+    def __init__(
+        self,
+        end: Theme | str,
+        start: Theme | str | None = None,
+        duration: int = 250,
+        fps: int = 30,
+        parent: QtCore.QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+
+        self._end = end
+        self._duration = duration / 1000
+        self._palettes: list[QtGui.QPalette] = []
+        self._start_time = 0.0
+        self._index = -1
+        self.dropped_frames = 0
+
+        end_theme = get_theme(end) if isinstance(end, str) else end
+        start_theme = get_theme(start) if isinstance(start, str) else start
+        if start_theme is None:
+            start_theme = get_theme()
+        if start_theme is not None and end_theme is not None:
+            count = max(2, math.ceil(self._duration * fps) + 1)
+            for i in range(count):
+                # Intermediate palettes bypass the palette cache to not evict themes.
+                theme = interpolate_themes(start_theme, end_theme, i / (count - 1))
+                palette = QtGui.QPalette()
+                update_palette(palette, theme)
+                self._palettes.append(palette)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(max(1, round(1000 / fps)))
+        self._timer.timeout.connect(self._step)
+
+    def start(self) -> None:
+        """
+        Start the transition. Without a start theme, the target theme is set directly.
+        """
+
+        if not self._palettes:
+            self._finish()
+            return
+        self._start_time = time.perf_counter()
+        self._index = -1
+        self.dropped_frames = 0
+        self._step()
+        self._timer.start()
+
+    def stop(self) -> None:
+        """Stop the transition and set the target theme."""
+
+        if self._timer.isActive():
+            self._finish()
+
+    def is_running(self) -> bool:
+        return self._timer.isActive()
+
+    def _step(self) -> None:
+        elapsed = time.perf_counter() - self._start_time
+        if elapsed >= self._duration:
+            self._finish()
+            return
+
+        index = int(elapsed / self._duration * (len(self._palettes) - 1))
+        if index <= self._index:
+            return
+        self.dropped_frames += max(0, index - self._index - 1)
+        self._index = index
+        apply_palette(self._palettes[index])
+
+    def _finish(self) -> None:
+        self._timer.stop()
+        set_theme(self._end, style=None)
+        if self.dropped_frames:
+            logger.debug(f'Dropped {self.dropped_frames} transition frames.')
+        self.finished.emit()
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import logging
+import os
+from json import JSONDecodeError
+
+from ._qt import QtCore
+from ._theme import (
+    NAME_PROPERTY_NAME,
+    _get_paths,
+    _list_theme_files,
+    _registry,
+    _theme_dependencies,
+    set_theme,
+)
+
+logger = logging.getLogger(__package__)
+
+
+class ThemeWatcher(QtCore.QObject):
+    """
+    Watch the theme search paths and reload themes when their files change.
+
+    Changes are collected and processed together once no new change happened for
+    `debounce` milliseconds. Only the changed files are parsed again and directories are
+    only listed again when files were added or removed. If the theme that was set with
+    `set_theme()` changed, it is applied again.
+
+    The watcher uses a QFileSystemWatcher and falls back to polling the files every
+    `poll_interval` milliseconds if the paths cannot be watched or `polling` is True.
+    """
+
+    theme_changed: QtCore.Signal = QtCore.Signal(str)
+    themes_changed: QtCore.Signal = QtCore.Signal()
+
+    def __init__(
+        self,
+        parent: QtCore.QObject | None = None,
+        debounce: int = 200,
+        polling: bool = False,
+        poll_interval: int = 1000,
+    ) -> None:
+        super().__init__(parent)
+
+        self._polling = polling
+        self._watcher: QtCore.QFileSystemWatcher | None = None
+        self._listings: dict[str, set[str]] = {}
+        self._stats: dict[str, tuple[int, int]] = {}
+        self._pending: set[str] = set()
+        # The files and search paths each theme file depends on through `extends`, and
+        # the theme files that depend on each of them.
+        self._dependencies: dict[str, tuple[str, ...]] = {}
+        self._dependents: dict[str, set[str]] = {}
+
+        self._debounce_timer = QtCore.QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(debounce)
+        self._debounce_timer.timeout.connect(self._process)
+
+        self._poll_timer = QtCore.QTimer(self)
+        self._poll_timer.setInterval(poll_interval)
+        self._poll_timer.timeout.connect(self._poll)
+
+    def start(self) -> None:
+        """Start watching the current search paths."""
+
+        self.stop()
+        for themes_path in _get_paths():
+            if not os.path.isdir(themes_path):
+                continue
+            self._listings[themes_path] = set(_list_themes(themes_path))
+            self._stats[themes_path] = _stat(themes_path)
+            for path in self._listings[themes_path]:
+                self._stats[path] = _stat(path)
+                self._update_dependencies(path)
+
+        if not self._polling:
+            self._watcher = QtCore.QFileSystemWatcher(self)
+            self._watcher.fileChanged.connect(self._queue)
+            self._watcher.directoryChanged.connect(self._queue)
+            if failed := self._watcher.addPaths(list(self._stats)):
+                logger.debug(f'Cannot watch {failed}, falling back to polling.')
+                self._watcher.deleteLater()
+                self._watcher = None
+
+        if self._watcher is None:
+            self._poll_timer.start()
+
+    def stop(self) -> None:
+        """Stop watching and discard pending changes."""
+
+        self._poll_timer.stop()
+        self._debounce_timer.stop()
+        if self._watcher is not None:
+            self._watcher.deleteLater()
+            self._watcher = None
+        self._listings.clear()
+        self._stats.clear()
+        self._pending.clear()
+        self._dependencies.clear()
+        self._dependents.clear()
+
+    def is_active(self) -> bool:
+        return self._watcher is not None or self._poll_timer.isActive()
+
+    def _queue(self, path: str) -> None:
+        self._pending.add(path)
+        self._debounce_timer.start()
+
+    def _poll(self) -> None:
+        for path, stat in self._stats.items():
+            if (new_stat := _stat(path)) != stat:
+                # Update the stat so the next poll doesn't restart the debounce.
+                self._stats[path] = new_stat
+                self._queue(path)
+
+    def _process(self) -> None:
+        pending = self._pending
+        self._pending = set()
+
+        changed_names = set()
+        added_or_removed = False
+        # Directories first so removed files aren't parsed.
+        for path in sorted(pending, key=lambda p: p not in self._listings):
+            if path in self._listings:
+                names = self._update_directory(path)
+                added_or_removed = added_or_removed or bool(names)
+                changed_names.update(names)
+            elif path in self._stats:
+                changed_names.update(self._update_file(path))
+
+        for name in sorted(changed_names):
+            self.theme_changed.emit(name)
+        if added_or_removed:
+            self.themes_changed.emit()
+
+        application = QtCore.QCoreApplication.instance()
+        if application is None:
+            return
+        if (name := application.property(NAME_PROPERTY_NAME)) in changed_names:
+            logger.debug(f'Reloading theme {name!r}.')
+            set_theme(name, style=None)
+
+    def _update_directory(self, themes_path: str) -> set[str]:
+        """
+        Returns the names of the themes that were added or removed and of the themes
+        that extend them.
+        """
+
+        self._stats[themes_path] = _stat(themes_path)
+        old_paths = self._listings[themes_path]
+        new_paths = set(_list_themes(themes_path))
+        self._listings[themes_path] = new_paths
+
+        removed_paths = old_paths - new_paths
+        added_paths = new_paths - old_paths
+        for path in removed_paths:
+            _registry.invalidate(path)
+            self._stats.pop(path, None)
+            self._pending.discard(path)
+            self._remove_dependencies(path)
+            if self._watcher is not None:
+                self._watcher.removePath(path)
+        for path in added_paths:
+            self._stats[path] = _stat(path)
+            self._update_dependencies(path)
+            if self._watcher is not None:
+                self._watcher.addPath(path)
+
+        names = {_theme_name(path) for path in removed_paths | added_paths}
+        if names:
+            # Themes extended by name can resolve to a different file now.
+            names.update(self._update_dependents(themes_path, *removed_paths))
+        return names
+
+    def _update_file(self, path: str) -> set[str]:
+        """
+        Returns the name of the theme if the file is still a valid theme and the names
+        of the themes that extend it.
+        """
+
+        self._stats[path] = _stat(path)
+        if not os.path.exists(path):
+            # Removed files are handled by the directory change.
+            return set()
+
+        # Editors that save by replacing the file remove it from the watcher.
+        if self._watcher is not None and path not in self._watcher.files():
+            self._watcher.addPath(path)
+
+        self._update_dependencies(path)
+        names = self._update_dependents(path)
+        try:
+            _registry.load(path)
+        except (JSONDecodeError, TypeError):
+            logger.warning(f'Invalid theme {path!r}.')
+            return names
+        except FileNotFoundError:
+            return names
+        names.add(_theme_name(path))
+        return names
+
+    def _update_dependencies(self, path: str) -> None:
+        """Updates the files and search paths that the theme at `path` depends on."""
+
+        self._remove_dependencies(path)
+        dependencies = tuple(os.path.normpath(p) for p in _theme_dependencies(path))
+        self._dependencies[path] = dependencies
+        for dependency in dependencies:
+            self._dependents.setdefault(dependency, set()).add(path)
+
+    def _remove_dependencies(self, path: str) -> None:
+        for dependency in self._dependencies.pop(path, ()):
+            if dependents := self._dependents.get(dependency):
+                dependents.discard(path)
+                if not dependents:
+                    del self._dependents[dependency]
+
+    def _update_dependents(self, *paths: str) -> set[str]:
+        """
+        Updates the dependencies of the themes that depend on `paths` and returns the
+        names of these themes.
+        """
+
+        dependents = set()
+        for path in paths:
+            dependents.update(self._dependents.get(os.path.normpath(path), ()))
+        for dependent in dependents:
+            self._update_dependencies(dependent)
+        return {_theme_name(path) for path in dependents}
+
+
+def _list_themes(themes_path: str) -> list[str]:
+    return [path for _, path in _list_theme_files(themes_path)]
+
+
+def _theme_name(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def _stat(path: str) -> tuple[int, int]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return -1, -1
+    return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,194 @@
+"""
+Headless benchmarks for theme discovery, parsing and palette application.
+
+Run with `python -m tests.benchmarks --output benchmarks.json` to write the results as
+JSON so they can be compared between releases.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6 import QtCore, QtGui, QtWidgets
+
+import qt_themes
+from qt_themes import _theme
+
+THEME_COUNTS = (10, 100, 1000)
+SEARCH_PATH_COUNT = 4
+WIDGET_COUNT = 2000
+
+
+def measure(
+    function: Callable[[], object],
+    repeat: int,
+    setup: Callable[[], object] | None = None,
+) -> dict:
+    """Return timing statistics in seconds for calling `function` `repeat` times."""
+
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return {
+        'repeat': repeat,
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.fmean(timings),
+        'max': max(timings),
+    }
+
+
+@contextlib.contextmanager
+def synthetic_themes(count: int, path_count: int = SEARCH_PATH_COUNT) -> Iterator[str]:
+    """Write `count` theme files spread across `path_count` search paths."""
+
+    source = qt_themes.get_colors('one_dark_two')
+    data = {key: color.name() for key, color in source.items()}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = []
+        for i in range(path_count):
+            path = os.path.join(temp_dir, f'themes_{i}')
+            os.makedirs(path)
+            paths.append(path)
+        for i in range(count):
+            path = os.path.join(paths[i % path_count], f'theme_{i}.json')
+            with open(path, 'w') as f:
+                json.dump(data, f)
+
+        env_path = os.environ.get(_theme.THEMES)
+        os.environ[_theme.THEMES] = os.pathsep.join(paths)
+        qt_themes.invalidate_cache()
+        try:
+            yield os.path.join(paths[0], 'theme_0.json')
+        finally:
+            if env_path is None:
+                os.environ.pop(_theme.THEMES, None)
+            else:
+                os.environ[_theme.THEMES] = env_path
+            qt_themes.invalidate_cache()
+
+
+def create_widget_tree(count: int) -> QtWidgets.QWidget:
+    """Return a window with `count` widgets nested in groups."""
+
+    window = QtWidgets.QWidget()
+    layout = QtWidgets.QVBoxLayout()
+    window.setLayout(layout)
+    group_layout = None
+    for i in range(count):
+        if i % 50 == 0:
+            group = QtWidgets.QGroupBox(f'Group {i // 50}')
+            group_layout = QtWidgets.QGridLayout()
+            group.setLayout(group_layout)
+            layout.addWidget(group)
+        if i % 2:
+            widget = QtWidgets.QPushButton(f'Button {i}')
+        else:
+            widget = QtWidgets.QLineEdit(f'Line Edit {i}')
+        group_layout.addWidget(widget, (i % 50) // 5, i % 5)
+    window.resize(1280, 720)
+    window.show()
+    return window
+
+
+def run_benchmarks(repeat: int = 20) -> list[dict]:
+    results = []
+
+    def add(name: str, timing: dict, **params: object) -> None:
+        results.append({'name': name, 'params': params, **timing})
+        print(f'{name} {params}: {timing["median"] * 1000:.3f} ms', file=sys.stderr)
+
+    # Parsing, the parsed files are cached so the cache is cleared before each call.
+    path = os.path.join(_theme._get_paths()[0], 'nord.json')
+    add(
+        '_load', measure(lambda: _theme._load(path), repeat, qt_themes.invalidate_cache)
+    )
+
+    # Single theme
+    add(
+        'get_theme',
+        measure(
+            lambda: qt_themes.get_theme('nord'), repeat, qt_themes.invalidate_cache
+        ),
+        cache='cold',
+    )
+    add('get_theme', measure(lambda: qt_themes.get_theme('nord'), repeat), cache='warm')
+
+    # All themes
+    for count in THEME_COUNTS:
+        with synthetic_themes(count):
+            params = {'themes': count, 'search_paths': SEARCH_PATH_COUNT}
+            timing = measure(qt_themes.get_themes, repeat, qt_themes.invalidate_cache)
+            add('get_themes', timing, cache='cold', **params)
+            timing = measure(qt_themes.get_themes, repeat)
+            add('get_themes', timing, cache='warm', **params)
+            timing = measure(qt_themes.discover_themes, repeat)
+            add('discover_themes', timing, **params)
+
+    # Palettes
+    theme = qt_themes.get_theme('nord')
+    add('update_palette', measure(lambda: _update_palette(theme), repeat))
+
+    window = create_widget_tree(WIDGET_COUNT)
+    QtWidgets.QApplication.processEvents()
+    themes = ('nord', 'catppuccin_latte')
+    index = 0
+
+    def set_theme() -> None:
+        nonlocal index
+        qt_themes.set_theme(themes[index % len(themes)], style=None)
+        # Palette change events are sent synchronously, flush any posted events too.
+        QtWidgets.QApplication.processEvents()
+        index += 1
+
+    add('set_theme', measure(set_theme, repeat), widgets=WIDGET_COUNT)
+    window.close()
+    return results
+
+
+def _update_palette(theme: qt_themes.Theme) -> None:
+    palette = QtGui.QPalette()
+    qt_themes.update_palette(palette, theme)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', help='path to write the JSON results to')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+    results = {
+        'version': qt_themes.__version__,
+        'python': platform.python_version(),
+        'qt': QtCore.qVersion(),
+        'platform': platform.platform(),
+        'qpa_platform': app.platformName(),
+        'results': run_benchmarks(args.repeat),
+    }
+
+    data = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(data)
+    else:
+        print(data)
+
+
+if __name__ == '__main__':
+    main()
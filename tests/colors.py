@@ -54,7 +54,7 @@ class ColorRoleWidget(QtWidgets.QWidget):
         control_layout.addWidget(theme_label)
         theme_combobox = QtWidgets.QComboBox()
         names = ['default']
-        names.extend(qt_themes.get_themes().keys())
+        names.extend(qt_themes.discover_themes().keys())
         theme_combobox.addItems(names)
         theme_combobox.currentTextChanged.connect(self._set_theme)
         control_layout.addWidget(theme_combobox)
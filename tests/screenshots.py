@@ -0,0 +1,259 @@
+"""
+Headless screenshots of the widget gallery for every theme and style.
+
+Run with `python -m tests.screenshots --output screenshots` to render the screenshots.
+With `--baseline`, the screenshots are compared against stored baselines and the
+changed regions are reported, the exit code is 1 if any screenshot changed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import dataclasses
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np
+from PySide6 import QtCore, QtGui, QtWidgets
+
+import qt_themes
+from tests.widgets import MainWindow
+
+DEFAULT_THEME = 'default'
+FILE_NAME = os.path.join('{style}', '{theme}.png')
+TILE_SIZE = 32
+# A fixed date so the date and calendar widgets render the same every day.
+DATE_TIME = QtCore.QDateTime(QtCore.QDate(2024, 1, 15), QtCore.QTime(12, 0))
+
+
+@dataclasses.dataclass
+class Screenshot:
+    theme: str
+    style: str
+    path: str
+    # Changed pixels compared to the baseline.
+    changed: int = 0
+    # Bounding boxes (x, y, width, height) of the changed regions.
+    regions: list[tuple[int, int, int, int]] = dataclasses.field(default_factory=list)
+    error: str | None = None
+
+
+def render_screenshots(
+    output: str,
+    themes: list[str] | None = None,
+    styles: list[str] | None = None,
+    file_name: str = FILE_NAME,
+    baseline: str | None = None,
+    tolerance: int = 0,
+    max_workers: int | None = None,
+) -> list[Screenshot]:
+    """
+    Render the widget gallery for every combination of theme and style.
+
+    The combinations are spread across a process pool, each worker process has its own
+    QApplication on the offscreen platform.
+
+    :param output: The directory to write the screenshots to.
+    :param file_name: The file name relative to `output`, formatted with the theme and
+        style.
+    :param baseline: The directory with the baselines to compare the screenshots to.
+    :param tolerance: The channel difference that is still considered unchanged.
+    """
+
+    if themes is None:
+        themes = [DEFAULT_THEME, *qt_themes.discover_themes()]
+    if styles is None:
+        styles = [style.lower() for style in QtWidgets.QStyleFactory.keys()]
+
+    jobs = []
+    for style in styles:
+        for theme in themes:
+            path = file_name.format(theme=theme, style=style)
+            baseline_path = os.path.join(baseline, path) if baseline else None
+            jobs.append((theme, style, os.path.join(output, path), baseline_path))
+
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(
+        max_workers, mp_context=context, initializer=_init_worker
+    ) as executor:
+        futures = [executor.submit(_render, *job, tolerance) for job in jobs]
+        return [future.result() for future in futures]
+
+
+def compare_images(
+    image: QtGui.QImage,
+    baseline: QtGui.QImage,
+    tolerance: int = 0,
+    ignore: list[QtCore.QRect] | None = None,
+) -> tuple[int, list[tuple[int, int, int, int]]]:
+    """
+    Return the number of changed pixels and the bounding boxes of the changed regions.
+
+    Changed pixels are grouped in tiles and adjacent tiles are merged into regions.
+    Pixels in the `ignore` rectangles are not compared.
+    """
+
+    if image.size() != baseline.size():
+        return image.width() * image.height(), [(0, 0, image.width(), image.height())]
+
+    a = _image_array(image).astype(np.int16)
+    b = _image_array(baseline).astype(np.int16)
+    mask = (np.abs(a - b) > tolerance).any(axis=-1)
+    for rect in ignore or ():
+        mask[rect.top() : rect.bottom() + 1, rect.left() : rect.right() + 1] = False
+    changed = int(mask.sum())
+    if not changed:
+        return 0, []
+
+    height, width = mask.shape
+    rows = -(-height // TILE_SIZE)
+    columns = -(-width // TILE_SIZE)
+    padded = np.zeros((rows * TILE_SIZE, columns * TILE_SIZE), dtype=bool)
+    padded[:height, :width] = mask
+    tiles = padded.reshape(rows, TILE_SIZE, columns, TILE_SIZE).any(axis=(1, 3))
+
+    regions = []
+    visited = np.zeros_like(tiles)
+    for row, column in zip(*np.nonzero(tiles)):
+        if visited[row, column]:
+            continue
+        visited[row, column] = True
+        # Flood fill the connected tiles.
+        queue = collections.deque([(row, column)])
+        top, left, bottom, right = row, column, row, column
+        while queue:
+            r, c = queue.popleft()
+            top, left = min(top, r), min(left, c)
+            bottom, right = max(bottom, r), max(right, c)
+            for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                if 0 <= nr < rows and 0 <= nc < columns:
+                    if tiles[nr, nc] and not visited[nr, nc]:
+                        visited[nr, nc] = True
+                        queue.append((nr, nc))
+
+        # Shrink the region to the changed pixels.
+        y0, x0 = top * TILE_SIZE, left * TILE_SIZE
+        y1, x1 = (bottom + 1) * TILE_SIZE, (right + 1) * TILE_SIZE
+        ys, xs = np.nonzero(padded[y0:y1, x0:x1])
+        x, y = int(x0 + xs.min()), int(y0 + ys.min())
+        regions.append((x, y, int(x0 + xs.max()) - x + 1, int(y0 + ys.max()) - y + 1))
+    return changed, regions
+
+
+def _init_worker() -> None:
+    QtCore.qInstallMessageHandler(_message_handler)
+    QtWidgets.QApplication(sys.argv[:1])
+
+
+def _render(
+    theme: str,
+    style: str,
+    path: str,
+    baseline_path: str | None,
+    tolerance: int,
+) -> Screenshot:
+    screenshot = Screenshot(theme, style, path)
+
+    # A new window for every screenshot, so previous screenshots can't affect the
+    # layout. The gallery sets the Fusion style, so the style is set afterwards.
+    window = MainWindow()
+    QtWidgets.QApplication.setStyle(style)
+    qt_themes.set_theme(None if theme == DEFAULT_THEME else theme, style=None)
+    for widget in window.findChildren(QtWidgets.QDateTimeEdit):
+        widget.setDateTime(DATE_TIME)
+    for widget in window.findChildren(QtWidgets.QCalendarWidget):
+        widget.setSelectedDate(DATE_TIME.date())
+    window.show()
+    QtWidgets.QApplication.processEvents()
+
+    # Grab from the window, so the window background is drawn behind the gallery.
+    widget = window.centralWidget()
+    image = window.grab(widget.geometry()).toImage()
+    # Busy indicators are animated, so they are excluded from the comparison.
+    ignore = []
+    for progress_bar in widget.findChildren(QtWidgets.QProgressBar):
+        if progress_bar.maximum() == 0 and progress_bar.isVisible():
+            top_left = progress_bar.mapTo(widget, QtCore.QPoint())
+            ignore.append(QtCore.QRect(top_left, progress_bar.size()))
+    window.close()
+    window.deleteLater()
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    if not image.save(path):
+        screenshot.error = f'Cannot save {path!r}.'
+        return screenshot
+
+    if baseline_path is not None:
+        baseline = QtGui.QImage(baseline_path)
+        if baseline.isNull():
+            screenshot.error = f'Missing baseline {baseline_path!r}.'
+            return screenshot
+        screenshot.changed, screenshot.regions = compare_images(
+            image, baseline, tolerance, ignore
+        )
+    return screenshot
+
+
+def _message_handler(
+    mode: QtCore.QtMsgType, context: QtCore.QMessageLogContext, message: str
+) -> None:
+    # The offscreen platform warns about every window that is shown.
+    if 'propagateSizeHints' not in message:
+        print(message, file=sys.stderr)
+
+
+def _image_array(image: QtGui.QImage) -> np.ndarray:
+    image = image.convertToFormat(QtGui.QImage.Format.Format_RGBA8888)
+    array = np.frombuffer(image.constBits(), dtype=np.uint8)
+    array = array.reshape(image.height(), image.bytesPerLine())
+    # Copy the pixels, the converted image is deleted when this function returns.
+    array = array[:, : image.width() * 4].reshape(image.height(), image.width(), 4)
+    return array.copy()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', default='screenshots', help='output directory')
+    parser.add_argument('--baseline', help='directory with the baselines to compare')
+    parser.add_argument('--themes', nargs='+', help='themes, by default all themes')
+    parser.add_argument('--styles', nargs='+', help='styles, by default all styles')
+    parser.add_argument('--tolerance', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args()
+
+    screenshots = render_screenshots(
+        args.output,
+        themes=args.themes,
+        styles=args.styles,
+        baseline=args.baseline,
+        tolerance=args.tolerance,
+        max_workers=args.workers,
+    )
+
+    failed = [s for s in screenshots if s.error or s.changed]
+    if args.json:
+        print(json.dumps([dataclasses.asdict(s) for s in screenshots], indent=2))
+    else:
+        for screenshot in screenshots:
+            if screenshot.error:
+                status = screenshot.error
+            elif screenshot.changed:
+                regions = ', '.join(
+                    f'{w}x{h}+{x}+{y}' for x, y, w, h in screenshot.regions
+                )
+                status = f'{screenshot.changed} pixels changed in {regions}'
+            else:
+                status = 'ok'
+            print(f'{screenshot.style} {screenshot.theme}: {status}')
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
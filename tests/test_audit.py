@@ -0,0 +1,32 @@
+import unittest
+
+import qt_themes
+from qt_themes import _audit
+
+
+class AuditTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        themes = {'nord': qt_themes.get_theme('nord')}
+        cls.checks = {
+            (check.group, check.foreground, check.background): check
+            for check in qt_themes.audit_themes(themes).checks
+        }
+
+    def test_inactive_highlighted_text(self) -> None:
+        check = self.checks[('Inactive', 'HighlightedText', 'Highlight')]
+        self.assertEqual(check.minimum, 4.5)
+
+    def test_inactive_links(self) -> None:
+        for role in _audit.INACTIVE_MUTED_ROLES:
+            check = self.checks[('Inactive', role, 'Base')]
+            self.assertEqual(check.minimum, _audit.INACTIVE_MINIMUM)
+
+    def test_disabled(self) -> None:
+        for (group, *_), check in self.checks.items():
+            if group == 'Disabled':
+                self.assertEqual(check.minimum, _audit.DISABLED_MINIMUM)
+
+
+if __name__ == '__main__':
+    unittest.main()
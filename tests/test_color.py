@@ -0,0 +1,25 @@
+import unittest
+
+from qt_themes import Color
+
+
+class ColorTest(unittest.TestCase):
+    def test_hex(self) -> None:
+        self.assertEqual(Color.from_string('#abc'), Color(0xAA, 0xBB, 0xCC))
+        self.assertEqual(Color.from_string('#AbCdEf'), Color(0xAB, 0xCD, 0xEF))
+        self.assertEqual(Color.from_string('#80ff0000'), Color(0xFF, 0, 0, 0x80))
+        self.assertEqual(Color.from_string('#fffaaabbb'), Color(0xFF, 0xAA, 0xBB))
+
+    def test_name(self) -> None:
+        self.assertEqual(Color.from_string('Alice Blue'), Color(0xF0, 0xF8, 0xFF))
+        self.assertEqual(Color.from_string('transparent'), Color(0, 0, 0, 0))
+
+    def test_invalid(self) -> None:
+        values = ('#', '#12345', '#-12345', '#+12345', '#12_345', '# 12345', '#0x1234')
+        for value in values:
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                Color.from_string(value)
+
+
+if __name__ == '__main__':
+    unittest.main()
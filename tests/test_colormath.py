@@ -0,0 +1,67 @@
+import random
+import unittest
+from unittest import mock
+
+from PySide6 import QtGui
+
+from qt_themes import Color, Theme, _colormath, update_palette
+from qt_themes._theme import FIELDS
+
+# Enough themes to cover the rounding of QColor without making the test slow.
+THEME_COUNT = 100
+
+
+class DerivePaletteColorsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        rng = random.Random(0)
+        cls.themes = []
+        for i in range(THEME_COUNT):
+            colors = {
+                key: Color(*(rng.randrange(256) for _ in range(4))) for key in FIELDS
+            }
+            if i % 2:
+                # The highlighted text color changes at a value of 0.5.
+                value = rng.choice((127, 128))
+                colors['primary'] = Color(
+                    value, rng.randrange(value), rng.randrange(value), 255
+                )
+            cls.themes.append(Theme.from_colors(colors))
+
+        ColorRole = QtGui.QPalette.ColorRole
+        cls.expected = []
+        for theme in cls.themes:
+            palette = QtGui.QPalette()
+            update_palette(palette, theme)
+            highlighted_text = palette.color(ColorRole.HighlightedText)
+            bright_text = palette.color(ColorRole.BrightText)
+            cls.expected.append(
+                (
+                    tuple(Color.from_qcolor(highlighted_text)),
+                    tuple(Color.from_qcolor(bright_text)),
+                    theme.is_dark_theme(),
+                )
+            )
+
+    def assert_derived(self) -> None:
+        colors, _ = _colormath.theme_array(self.themes)
+        derived = _colormath.derive_palette_colors(colors)
+        for i, expected in enumerate(self.expected):
+            actual = (
+                tuple(int(v) for v in derived['highlighted_text'][i]),
+                tuple(int(v) for v in derived['bright_text'][i]),
+                bool(derived['is_dark'][i]),
+            )
+            self.assertEqual(expected, actual, self.themes[i])
+
+    @unittest.skipUnless(_colormath.has_numpy(), 'NumPy is not installed')
+    def test_numpy(self) -> None:
+        self.assert_derived()
+
+    def test_pure_python(self) -> None:
+        with mock.patch.object(_colormath, 'np', None):
+            self.assert_derived()
+
+
+if __name__ == '__main__':
+    unittest.main()
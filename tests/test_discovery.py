@@ -0,0 +1,52 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import qt_themes
+
+
+class ThemeCatalogTest(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.addCleanup(qt_themes.invalidate_cache)
+
+        colors = {key: c.name() for key, c in qt_themes.get_colors('nord').items()}
+        with open(os.path.join(temp_dir.name, 'valid.json'), 'w') as f:
+            json.dump(colors, f)
+        with open(os.path.join(temp_dir.name, 'broken.json'), 'w') as f:
+            f.write('{"primary": ')
+
+        patcher = mock.patch.dict(os.environ, {'QT_THEMES': temp_dir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_invalid_file(self) -> None:
+        catalog = qt_themes.discover_themes()
+        self.assertIn('broken', catalog)
+        with self.assertLogs('qt_themes', 'WARNING'):
+            self.assertIsNone(catalog['broken'])
+
+    def test_items(self) -> None:
+        with self.assertLogs('qt_themes', 'WARNING'):
+            themes = dict(qt_themes.discover_themes().items())
+        self.assertEqual(len(themes), len(qt_themes.discover_themes()))
+        self.assertIsNone(themes['broken'])
+        self.assertIsInstance(themes['valid'], qt_themes.Theme)
+
+    def test_valid_themes(self) -> None:
+        with self.assertLogs('qt_themes', 'WARNING'):
+            themes = qt_themes.get_themes()
+        catalog = qt_themes.discover_themes()
+        valid = {name: theme for name, theme in catalog.items() if theme is not None}
+        self.assertEqual(valid, themes)
+
+    def test_unknown_name(self) -> None:
+        with self.assertRaises(KeyError):
+            qt_themes.discover_themes()['unknown']
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import qt_themes
+
+
+def write_theme(path: str, data: dict) -> None:
+    """Write a theme file and move its mtime and that of its directory forward."""
+
+    with open(path, 'w') as f:
+        json.dump(data, f)
+    # File system timestamps can be coarser than the time between two writes.
+    for p in (path, os.path.dirname(path)):
+        stat = os.stat(p)
+        os.utime(p, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class ExtendsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.addCleanup(qt_themes.invalidate_cache)
+        self.path = temp_dir.name
+        self.nord = qt_themes.get_colors('nord')
+
+        patcher = mock.patch.dict(os.environ, {'QT_THEMES': self.path})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write(self, name: str, data: dict) -> str:
+        path = os.path.join(self.path, f'{name}.json')
+        write_theme(path, data)
+        return path
+
+    def test_extends_name(self) -> None:
+        self.write('child', {'extends': 'nord', 'primary': '#ff0000'})
+        colors = qt_themes.get_colors('child')
+        self.assertEqual(colors, {**self.nord, 'primary': qt_themes.Color(255, 0, 0)})
+
+    def test_extends_chain(self) -> None:
+        self.write('parent', {'extends': 'nord', 'primary': '#ff0000'})
+        self.write('child', {'extends': 'parent.json', 'secondary': '#00ff00'})
+        colors = qt_themes.get_colors('child')
+        self.assertEqual(colors['primary'], qt_themes.Color(255, 0, 0))
+        self.assertEqual(colors['secondary'], qt_themes.Color(0, 255, 0))
+        self.assertEqual(colors['base'], self.nord['base'])
+
+    def test_cycle(self) -> None:
+        self.write('a', {'extends': 'b', 'primary': '#ff0000'})
+        self.write('b', {'extends': 'a.json', 'primary': '#00ff00'})
+        with self.assertLogs('qt_themes', 'WARNING'):
+            self.assertIsNone(qt_themes.get_colors('a'))
+        with self.assertLogs('qt_themes', 'WARNING'):
+            self.assertIsNone(qt_themes.get_colors('b'))
+
+    def test_extends_itself(self) -> None:
+        self.write('by_name', {'extends': 'by_name'})
+        self.write('by_file', {'extends': './by_file.json'})
+        for name in ('by_name', 'by_file'):
+            with self.subTest(name=name), self.assertLogs('qt_themes', 'WARNING'):
+                self.assertIsNone(qt_themes.get_colors(name))
+
+    def test_missing_parent(self) -> None:
+        self.write('by_name', {'extends': 'missing'})
+        self.write('by_file', {'extends': 'missing.json'})
+        self.write('outside', {'extends': '../nord.json'})
+        self.write('directory', {'extends': '.json'})
+        for name in ('by_name', 'by_file', 'outside', 'directory'):
+            with self.subTest(name=name), self.assertLogs('qt_themes', 'WARNING'):
+                self.assertIsNone(qt_themes.get_colors(name))
+
+    def test_invalid_parent(self) -> None:
+        self.write('child', {'extends': 'parent.json'})
+        with open(os.path.join(self.path, 'parent.json'), 'w') as f:
+            f.write('{"primary": ')
+        with self.assertLogs('qt_themes', 'WARNING'):
+            self.assertIsNone(qt_themes.get_colors('child'))
+
+    def test_parent_changed(self) -> None:
+        self.write('parent', {'extends': 'nord', 'primary': '#ff0000'})
+        self.write('child', {'extends': 'parent.json', 'secondary': '#00ff00'})
+        self.assertEqual(
+            qt_themes.get_colors('child')['primary'], qt_themes.Color(255, 0, 0)
+        )
+
+        self.write('parent', {'extends': 'nord', 'primary': '#0000ff'})
+        self.assertEqual(
+            qt_themes.get_colors('child')['primary'], qt_themes.Color(0, 0, 255)
+        )
+
+    def test_parent_shadowed(self) -> None:
+        # Names resolve to the first search path that has a theme with the name.
+        first_path = os.path.join(self.path, 'first')
+        second_path = os.path.join(self.path, 'second')
+        os.mkdir(first_path)
+        os.mkdir(second_path)
+        os.environ['QT_THEMES'] = os.pathsep.join((first_path, second_path))
+
+        write_theme(os.path.join(second_path, 'parent.json'), {'primary': '#ff0000'})
+        write_theme(os.path.join(second_path, 'child.json'), {'extends': 'parent'})
+        self.assertEqual(
+            qt_themes.get_colors('child')['primary'], qt_themes.Color(255, 0, 0)
+        )
+
+        shadow_path = os.path.join(first_path, 'parent.json')
+        write_theme(shadow_path, {'primary': '#0000ff'})
+        self.assertEqual(
+            qt_themes.get_colors('child')['primary'], qt_themes.Color(0, 0, 255)
+        )
+
+        os.remove(shadow_path)
+        self.assertEqual(
+            qt_themes.get_colors('child')['primary'], qt_themes.Color(255, 0, 0)
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from PySide6 import QtCore
+
+import qt_themes
+from tests.test_extends import write_theme
+
+
+class ThemeWatcherTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.application = (
+            QtCore.QCoreApplication.instance() or QtCore.QCoreApplication()
+        )
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.addCleanup(qt_themes.invalidate_cache)
+        self.first_path = os.path.join(temp_dir.name, 'first')
+        self.second_path = os.path.join(temp_dir.name, 'second')
+        os.mkdir(self.first_path)
+        os.mkdir(self.second_path)
+
+        paths = os.pathsep.join((self.first_path, self.second_path))
+        patcher = mock.patch.dict(os.environ, {'QT_THEMES': paths})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.write('parent', {'primary': '#ff0000'})
+        self.write('other', {'primary': '#00ff00'})
+        self.write('child', {'extends': 'parent.json'})
+        self.write('grandchild', {'extends': 'child'})
+
+        self.watcher = qt_themes.ThemeWatcher(polling=True)
+        self.addCleanup(self.watcher.stop)
+        self.watcher.start()
+
+    def write(self, name: str, data: dict, path: str | None = None) -> str:
+        path = os.path.join(path or self.second_path, f'{name}.json')
+        write_theme(path, data)
+        return path
+
+    def changes(self) -> set[str]:
+        """Process the changes since the last call and return the changed themes."""
+
+        names = set()
+        self.watcher.theme_changed.connect(names.add)
+        self.watcher._poll()
+        self.watcher._process()
+        self.watcher.theme_changed.disconnect(names.add)
+        return names
+
+    def test_file_changed(self) -> None:
+        self.write('parent', {'primary': '#0000ff'})
+        self.assertEqual(self.changes(), {'parent', 'child', 'grandchild'})
+        colors = qt_themes.get_colors('grandchild')
+        self.assertEqual(colors['primary'], qt_themes.Color(0, 0, 255))
+
+    def test_extends_changed(self) -> None:
+        self.write('child', {'extends': 'other.json'})
+        self.assertEqual(self.changes(), {'child', 'grandchild'})
+
+        self.write('parent', {'primary': '#0000ff'})
+        self.assertEqual(self.changes(), {'parent'})
+        self.write('other', {'primary': '#0000ff'})
+        self.assertEqual(self.changes(), {'other', 'child', 'grandchild'})
+
+    def test_file_shadowed(self) -> None:
+        # The grandchild extends the child by name, so it resolves to the new file.
+        self.write('child', {'primary': '#0000ff'}, self.first_path)
+        self.assertEqual(self.changes(), {'child', 'grandchild'})
+        colors = qt_themes.get_colors('grandchild')
+        self.assertEqual(colors['primary'], qt_themes.Color(0, 0, 255))
+
+        # The shadowing file has no dependencies, so the parent is only extended by the
+        # child in the second search path.
+        self.write('parent', {'primary': '#ffff00'})
+        self.assertEqual(self.changes(), {'parent', 'child'})
+
+
+if __name__ == '__main__':
+    unittest.main()
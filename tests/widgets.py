@@ -4,6 +4,8 @@ from PySide6 import QtGui, QtWidgets, QtCore
 import qt_themes
 from tests import application
 
+ASSETS_PATH = os.path.join(os.path.dirname(__file__), '..', '.github', 'assets')
+
 
 class WidgetControls(QtWidgets.QWidget):
     style_changed: QtCore.Signal = QtCore.Signal(str)
@@ -38,7 +40,7 @@ class WidgetControls(QtWidgets.QWidget):
         layout.addWidget(theme_label)
         self.theme_combo = QtWidgets.QComboBox()
         names = ['default']
-        names.extend(qt_themes.get_themes().keys())
+        names.extend(qt_themes.discover_themes().keys())
         self.theme_combo.addItems(names)
         self.theme_combo.currentTextChanged.connect(self.theme_changed.emit)
         layout.addWidget(self.theme_combo)
@@ -138,7 +140,7 @@ class WidgetGallery(QtWidgets.QWidget):
         button = QtWidgets.QToolButton()
         button.setText('Icon')
         icon = self.style().standardIcon(QtWidgets.QStyle.StandardPixmap.SP_FileIcon)
-        button.setIcon(icon)
+        button.setIcon(qt_themes.themed_icon(icon))
         tool_button_layout.addWidget(button)
 
         # Checkbox Buttons
@@ -298,23 +300,16 @@ class WidgetGallery(QtWidgets.QWidget):
 
     def _screenshot(self) -> None:
         theme = self.controls.theme_combo.currentText()
-        path = os.path.join('..', '.github', 'assets', f'{theme}.png')
+        path = os.path.join(ASSETS_PATH, f'{theme}.png')
         pixmap = self.grab()
         pixmap.save(path)
 
     def _screenshot_all(self) -> None:
-        combo = self.controls.theme_combo
-        combo.blockSignals(True)
-        for i in range(combo.count()):
-            combo.setCurrentIndex(i)
-            theme = combo.currentText()
-            self._set_theme(theme)
-            QtWidgets.QApplication.processEvents()
-
-            path = os.path.join('..', '.github', 'assets', f'{theme}.png')
-            pixmap = self.grab()
-            pixmap.save(path)
-        combo.blockSignals(False)
+        # Rendered headless in worker processes, so this window stays unchanged.
+        from tests.screenshots import render_screenshots
+
+        style = self.style().name().lower()
+        render_screenshots(ASSETS_PATH, styles=[style], file_name='{theme}.png')
 
     def _set_disabled(self, disabled: bool) -> None:
         self.tab_widget.setEnabled(not disabled)